@@ -1,3 +1,4 @@
+import logging
 import sys
 import os
 
@@ -14,6 +15,7 @@ except ImportError as e:
     sys.exit(1)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
     print("Starting application from main.py...")
     app = ReactiveApp()
     try:
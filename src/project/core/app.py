@@ -1,7 +1,7 @@
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
     AmbientLight, DirectionalLight, Vec4, Vec3, Point3, WindowProperties,
-    CollisionTraverser, CollisionHandlerEvent, CollisionHandlerPusher,
+    CollisionTraverser, CollisionHandlerEvent,
     loadPrcFileData, BitMask32, TextNode
 )
 from direct.task import Task
@@ -11,28 +11,46 @@ from ..ui.options_menu import OptionsMenuUI
 from ..ui.hud import HeadsUpDisplayUI
 from ..utils.settings import SettingsManager
 from ..game.camera import CameraController
+import logging
 import sys
 
+_log = logging.getLogger(__name__)
+
 loadPrcFileData("", "window-title Reactive Abstract Environment (Third Person)")
 loadPrcFileData("", "sync-video #t")
 loadPrcFileData("", "show-frame-rate-meter #t")
 
 class ReactiveApp(ShowBase):
+    HUD_UPDATE_INTERVAL = 1.0 / 15.0
+
     def __init__(self):
         self.settings_manager = SettingsManager(self)
         self.settings_manager.apply_config_vars()
 
         ShowBase.__init__(self)
         self.setBackgroundColor(0.1, 0.2, 0.4, 1)
-        print("Initializing ReactiveApp...")
+        _log.debug("Initializing ReactiveApp...")
 
         self.game_active = False
         self.game_paused = False
+        # Mirrors `game_active and not game_paused` for the per-frame tasks.
+        self._sim_running = False
+
+        self._game_mouse_props = WindowProperties()
+        self._game_mouse_props.setCursorHidden(True)
+        self._game_mouse_props.setMouseMode(WindowProperties.M_relative)
+        self._menu_mouse_props = WindowProperties()
+        self._menu_mouse_props.setCursorHidden(False)
+        self._menu_mouse_props.setMouseMode(WindowProperties.M_absolute)
 
         self.settings_manager.apply_runtime_settings()
 
+        self._event_in = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_IN', 'player-into-trigger')
+        self._event_out = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_OUT', 'player-out-trigger')
+        self._event_in_any = f"{self._event_in}-*"
+        self._event_out_any = f"{self._event_out}-*"
+
         self.cTrav = CollisionTraverser("CollisionTraverser_Main")
-        self.pusher_handler = CollisionHandlerPusher()
         self.event_handler = CollisionHandlerEvent()
 
         self.environment_manager = None
@@ -47,10 +65,16 @@ class ReactiveApp(ShowBase):
 
         self.main_menu.show()
         self.accept('escape', self.handle_escape_key)
-        
-        self.taskMgr.add(self._run_collisions, "collisionTask", priority=0)
 
-        print("Initialization complete. Showing main menu.")
+        # self.cTrav is traversed by ShowBase's own collisionLoop task (sort 30), after
+        # playerMoveTask (sort 20) and before the camera task (sort 40).
+
+        _log.debug("Initialization complete. Showing main menu.")
+
+    @property
+    def sim_running(self):
+        """True while a game session is active and not paused."""
+        return self._sim_running
 
     def handle_escape_key(self):
         if self.game_active and not self.game_paused:
@@ -61,21 +85,21 @@ class ReactiveApp(ShowBase):
                                not self.options_menu.frame.isHidden()
 
             if options_visible:
-                print("Escape: Options visible, returning to previous (Pause Menu)")
+                _log.debug("Escape: Options visible, returning to previous (Pause Menu)")
                 self.options_menu.back_to_previous()
             else:
-                print("Escape: In Pause Menu, resuming game.")
+                _log.debug("Escape: In Pause Menu, resuming game.")
                 self.resume_game()
 
         elif hasattr(self.main_menu, 'frame') and not self.main_menu.frame.isHidden() and \
               hasattr(self, 'options_menu') and self.options_menu and \
               hasattr(self.options_menu, 'frame') and self.options_menu.frame and \
               not self.options_menu.frame.isHidden():
-              print("Escape: In Main Menu Options, returning to Main Menu")
+              _log.debug("Escape: In Main Menu Options, returning to Main Menu")
               self.options_menu.back_to_previous()
 
     def start_game(self):
-        print("Starting new game...")
+        _log.debug("Starting new game...")
         self.cleanup_game_session()
 
         self.main_menu.hide()
@@ -96,16 +120,17 @@ class ReactiveApp(ShowBase):
 
         self.game_active = True
         self.game_paused = False
+        self._sim_running = True
 
         self.hud.show()
         self._set_game_mouse_properties()
 
-        self.taskMgr.add(self._update_hud, "updateHudTask", sort=30)
+        self.taskMgr.doMethodLater(self.HUD_UPDATE_INTERVAL, self._update_hud, "updateHudTask")
 
-        print("Game started.")
+        _log.debug("Game started.")
 
     def cleanup_game_session(self):
-        print("Cleaning up active game session...")
+        _log.debug("Cleaning up active game session...")
         self.taskMgr.remove("playerMoveTask")
         self.taskMgr.remove("updateHudTask")
         
@@ -117,29 +142,30 @@ class ReactiveApp(ShowBase):
             self.player = None
             
         if self.environment_manager:
-            event_in = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_IN', 'player-into-trigger')
-            event_out = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_OUT', 'player-out-trigger')
-            self.ignore(f"{event_in}-*")
-            self.ignore(f"{event_out}-*")
+            self.ignore(self._event_in_any)
+            self.ignore(self._event_out_any)
             self.environment_manager.cleanup()
             self.environment_manager = None
 
         self.hud.hide()
         self.game_active = False
         self.game_paused = False
+        self._sim_running = False
 
     def pause_game(self):
         if not self.game_active or self.game_paused: return
-        print("Pausing game...")
+        _log.debug("Pausing game...")
         self.game_paused = True
+        self._sim_running = False
         self._set_menu_mouse_properties()
         self.pause_menu.show()
         self.hud.hide_crosshair()
 
     def resume_game(self):
         if not self.game_active or not self.game_paused: return
-        print("Resuming game...")
+        _log.debug("Resuming game...")
         self.game_paused = False
+        self._sim_running = True
         self.pause_menu.hide()
         self.options_menu.hide()
         self.hud.show_crosshair()
@@ -148,53 +174,33 @@ class ReactiveApp(ShowBase):
             if props.hasSize():
                  self.win.movePointer(0, int(props.getXSize() / 2), int(props.getYSize() / 2))
         self._set_game_mouse_properties()
-        print("Game resumed.")
+        _log.debug("Game resumed.")
 
     def _set_game_mouse_properties(self):
         if self.win:
-            props = WindowProperties()
-            props.setCursorHidden(True)
-            props.setMouseMode(WindowProperties.M_relative)
-            self.win.requestProperties(props)
+            self.win.requestProperties(self._game_mouse_props)
 
     def _set_menu_mouse_properties(self):
         if self.win:
-            props = WindowProperties()
-            props.setCursorHidden(False)
-            props.setMouseMode(WindowProperties.M_absolute)
-            self.win.requestProperties(props)
+            self.win.requestProperties(self._menu_mouse_props)
 
     def _setup_collision_events(self):
-        print("Setting up collision event patterns for triggers...")
+        _log.debug("Setting up collision event patterns for triggers...")
         self.event_handler.clearInPatterns()
         self.event_handler.clearOutPatterns()
-        event_in = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_IN', 'player-into-trigger')
-        event_out = self.settings_manager.get_constant('reactive_elements', 'COLLISION_EVENT_OUT', 'player-out-trigger')
-        self.event_handler.addInPattern(f"{event_in}-%in")
-        self.event_handler.addOutPattern(f"{event_out}-%in")
-        self.accept(f"{event_in}-*", self.handle_collision_event, extraArgs=[True])
-        self.accept(f"{event_out}-*", self.handle_collision_event, extraArgs=[False])
-        print("Trigger collision event patterns setup complete.")
-
-    def handle_collision_event(self, is_enter, entry):
-        if self.game_active and not self.game_paused and self.environment_manager:
-            if is_enter:
-                self.environment_manager.handle_collision_enter(entry)
-            else:
-                self.environment_manager.handle_collision_exit(entry)
-
-    def _run_collisions(self, task):
-        """Runs the main collision traverser for player physics and triggers."""
-        if self.game_active and not self.game_paused:
-            self.cTrav.traverse(self.render)
-        return Task.cont
+        self.event_handler.addInPattern(f"{self._event_in}-%in")
+        self.event_handler.addOutPattern(f"{self._event_out}-%in")
+        # Bound straight to the environment; the active/paused guard lives in ReactiveManager.
+        self.accept(self._event_in_any, self.environment_manager.handle_collision_enter)
+        self.accept(self._event_out_any, self.environment_manager.handle_collision_exit)
+        _log.debug("Trigger collision event patterns setup complete.")
 
     def add_collider_to_main_traverser(self, collider_np, handler):
         """Adds a collider and handler to the main traverser (self.cTrav)."""
         if self.cTrav:
             self.cTrav.addCollider(collider_np, handler)
         else:
-            print(f"ERROR: Main CollisionTraverser (cTrav) not available to add {collider_np.getName()}")
+            _log.error("Main CollisionTraverser (cTrav) not available to add %s", collider_np.getName())
 
     def remove_collider_from_main_traverser(self, collider_np):
         """Removes a collider from the main traverser."""
@@ -202,24 +208,27 @@ class ReactiveApp(ShowBase):
             self.cTrav.removeCollider(collider_np)
 
     def _update_hud(self, task):
-        """Task to update HUD elements like the minimap."""
-        if self.game_active and not self.game_paused and self.player and self.hud:
-            if hasattr(self.player, 'player_root') and self.player.player_root and not self.player.player_root.isEmpty():
-                try:
-                    player_pos = self.player.player_root.getPos(self.render)
-                    self.hud.update_minimap(player_pos)
-                except Exception as e:
-                    print(f"Error updating minimap: {e}")
-        return Task.cont
+        """Throttled task (HUD_UPDATE_INTERVAL) to update HUD elements like the minimap."""
+        if not self._sim_running or self.player is None or self.hud is None:
+            return Task.again
+        player_root = self.player.player_root
+        if not player_root or player_root.isEmpty():
+            return Task.again
+        try:
+            self.hud.update_minimap(player_root.getPos(self.render))
+        except Exception:
+            _log.exception("Error updating minimap; stopping HUD updates for this session.")
+            return Task.done
+        return Task.again
 
     def userExit(self):
-        print("User requested exit.")
+        _log.debug("User requested exit.")
+        self._sim_running = False
         self.cleanup()
         sys.exit()
 
     def cleanup(self):
-        print("Cleaning up ReactiveApp...")
-        self.taskMgr.remove("collisionTask")
+        _log.debug("Cleaning up ReactiveApp...")
         self.taskMgr.remove("updateHudTask")
         self.cleanup_game_session()
 
@@ -236,4 +245,4 @@ class ReactiveApp(ShowBase):
         if hasattr(self, 'cTrav') and self.cTrav:
             self.cTrav.clearColliders()
 
-        print("ReactiveApp cleanup complete.")
\ No newline at end of file
+        _log.debug("ReactiveApp cleanup complete.")
\ No newline at end of file
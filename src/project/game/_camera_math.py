@@ -0,0 +1,37 @@
+import math
+
+from ..utils.jit import njit
+
+# Fraction of the remaining zoom distance covered each frame
+DISTANCE_SMOOTHING = 0.1
+
+
+# Explicit signature: compiled when the module loads rather than on the first camera frame.
+@njit("UniTuple(float64, 6)(float64, float64, float64, float64, float64, float64)", cache=True)
+def compute_third_person(cam_dist, target_dist, pitch_deg, sin_h, cos_h, lookat_h):
+    """
+    Scalar math for one third-person camera frame, relative to the player position.
+    Returns (new_cam_dist, look_pitch_deg, dir_x, dir_y, dir_z, dir_len_sq), where dir is
+    the normalized look-at -> camera direction (0, -1, 0 if degenerate) and dir_len_sq the
+    squared length of the unshortened offset.
+    """
+    new_dist = cam_dist + (target_dist - cam_dist) * DISTANCE_SMOOTHING
+
+    rad_pitch = math.radians(pitch_deg)
+    offset_y = -new_dist * math.cos(rad_pitch)
+    offset_z = new_dist * math.sin(rad_pitch)
+
+    dir_x = -offset_y * sin_h
+    dir_y = offset_y * cos_h
+    dir_z = offset_z - lookat_h
+    dir_len_sq = dir_x * dir_x + dir_y * dir_y + dir_z * dir_z
+    if dir_len_sq > 0.001:
+        inv_len = 1.0 / math.sqrt(dir_len_sq)
+        dir_x *= inv_len
+        dir_y *= inv_len
+        dir_z *= inv_len
+    else:
+        dir_x, dir_y, dir_z = 0.0, -1.0, 0.0
+
+    look_pitch = math.degrees(math.atan2(lookat_h - offset_z, -offset_y))
+    return new_dist, look_pitch, dir_x, dir_y, dir_z, dir_len_sq
@@ -0,0 +1,22 @@
+import math
+
+from ..utils.jit import njit
+
+
+# Explicit signature: compiled when the module loads rather than on the first movement frame.
+@njit("Tuple((float64, float64, boolean))(float64, float64, float64, float64)", cache=True)
+def compute_heading_step(current_h, dir_x, dir_y, max_turn):
+    """
+    Scalar math for turning the player toward a horizontal movement direction.
+    Returns (target_h, new_h, turned), where new_h is current_h moved at most max_turn
+    degrees toward target_h, wrapped to [0, 360); turned is False when already facing it.
+    """
+    target_h = math.degrees(math.atan2(-dir_x, dir_y))
+    delta_h = (target_h - current_h + 180.0) % 360.0 - 180.0
+    if abs(delta_h) <= 0.01:
+        return target_h, current_h, False
+    if delta_h > max_turn:
+        delta_h = max_turn
+    elif delta_h < -max_turn:
+        delta_h = -max_turn
+    return target_h, (current_h + delta_h) % 360.0, True
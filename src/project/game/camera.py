@@ -1,9 +1,15 @@
 from panda3d.core import (
     Point3, Vec3, CollisionRay, CollisionNode, CollisionHandlerQueue,
-    CollisionTraverser, BitMask32, WindowProperties, Lens, PerspectiveLens, LensNode
+    WindowProperties, Lens, PerspectiveLens, LensNode
 )
 from direct.task import Task
+from direct.showbase.DirectObject import DirectObject
+import logging
 import math
+from ._camera_math import compute_third_person
+from ..utils.settings import DEFAULT_CAMERA_MASK, ALL_OFF_MASK
+
+_log = logging.getLogger(__name__)
 
 class CameraController:
     """Unified camera controller supporting both first-person and third-person modes."""
@@ -15,7 +21,9 @@ class CameraController:
         self.app = app
         self.render = app.render
         self.camera = app.camera
-        print(f"CameraController Initialized. self.camera type: {type(self.camera)}, node type: {type(self.camera.node())}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("CameraController initialized. camera type: %s, node type: %s",
+                       type(self.camera), type(self.camera.node()))
         self.taskMgr = app.taskMgr
         self.settings_manager = app.settings_manager
         self.player = None
@@ -33,6 +41,11 @@ class CameraController:
 
         self.cam_heading = 0.0
         self.cam_pitch = 20.0
+        self._last_heading = None
+        self._sin_heading = 0.0
+        self._cos_heading = 1.0
+        self._tp_math_key = None
+        self._tp_math_result = None
         self.cam_min_pitch = self.camera_config["min_pitch"]
         self.cam_max_pitch = self.camera_config["max_pitch"]
 
@@ -42,7 +55,9 @@ class CameraController:
 
 
         self.mouse_dead_zone = 0.01
-
+        self._dead_sq = self.mouse_dead_zone ** 2
+        self._sensitivity_cache = None
+        self.settings_manager.add_change_listener(self._on_setting_changed)
 
         self.current_fov = self.settings_manager.get_fov()
         self.min_fov = self.settings_manager.get_constant('camera', 'MIN_FOV', 60.0)
@@ -55,6 +70,29 @@ class CameraController:
 
         self.app.accept('v', self.toggle_camera_mode)
 
+        # ShowBase already handles 'window-event' itself, so listen through a separate
+        # DirectObject rather than replacing its handler via app.accept.
+        self._win_cx = None
+        self._win_cy = None
+        self._window_events = DirectObject()
+        self._window_events.accept('window-event', self._on_window_event)
+
+    def _on_window_event(self, window):
+        """Refreshes the cached window center used to recenter the mouse pointer."""
+        if window is None or window != self.app.win:
+            return
+        props = window.getProperties()
+        if props.hasSize():
+            self._win_cx = props.getXSize() // 2
+            self._win_cy = props.getYSize() // 2
+        else:
+            self._win_cx = self._win_cy = None
+
+    def _on_setting_changed(self, key):
+        """Invalidates cached settings values when the user changes them."""
+        if key == 'sensitivity':
+            self._sensitivity_cache = None
+
     def _setup_camera_config(self):
         """Load camera settings from settings manager."""
         self.camera_config = {
@@ -73,26 +111,48 @@ class CameraController:
         self.cam_coll_ray = CollisionRay()
         self.cam_coll_node = CollisionNode('camera-collider')
         self.cam_coll_node.addSolid(self.cam_coll_ray)
-        mask_camera = self.settings_manager.get_constant('collision', 'MASK_CAMERA', BitMask32(8))
+        mask_camera = self.settings_manager.get_constant('collision', 'MASK_CAMERA', DEFAULT_CAMERA_MASK)
         self.cam_coll_node.setFromCollideMask(mask_camera)
-        self.cam_coll_node.setIntoCollideMask(BitMask32.allOff())
+        self.cam_coll_node.setIntoCollideMask(ALL_OFF_MASK)
         self.cam_coll_np = None
         self.cam_coll_handler = CollisionHandlerQueue()
-        self.cam_coll_traverser = CollisionTraverser('camera_collision_trav')
+
+        # Scratch buffers reused by the third-person update to avoid per-frame allocations.
+        self._scratch_look = Point3()
+        self._scratch_dir = Vec3()
+        self._scratch_final = Point3()
+        self._last_player_transform = None
+        self._last_player_pos = None
+
+    def _get_player_pos(self):
+        """Returns the player's render-space position, reusing it while the transform is unchanged.
+
+        PlayerRoot is parented to render, so its local TransformState is its world transform;
+        TransformStates are uniquified, so an unchanged state compares equal without composing.
+        """
+        player_root = self.player.player_root
+        ts = player_root.getTransform()
+        if self._last_player_pos is None or ts != self._last_player_transform:
+            self._last_player_transform = ts
+            self._last_player_pos = player_root.getPos(self.render)
+        return self._last_player_pos
 
     def setup(self, player=None):
         """Initialize the camera for in-game use."""
-        print("Setting up camera system...")
+        _log.debug("Setting up camera system...")
         self.app.disableMouse()
 
         if player:
             self.player = player
 
         self.cam_pivot = self.render.attachNewNode("camera_pivot")
-        print(f"Created camera pivot: {self.cam_pivot}")
+        _log.debug("Created camera pivot: %s", self.cam_pivot)
 
         self.cam_coll_np = self.camera.attachNewNode(self.cam_coll_node)
-        self.cam_coll_traverser.addCollider(self.cam_coll_np, self.cam_coll_handler)
+        # The ray rides on the main traverser, walked once per frame by ShowBase's collisionLoop.
+        # The camera task re-aims the ray after that traversal, so the hits it reads were
+        # found along the previous frame's ray: camera collision lags by one frame.
+        self.app.add_collider_to_main_traverser(self.cam_coll_np, self.cam_coll_handler)
 
         self.camera.reparentTo(self.render)
         self.cam_dist = self.camera_config["distance"]
@@ -104,17 +164,19 @@ class CameraController:
 
         if self.player and self.player.player_root and not self.player.player_root.isEmpty():
             if self.camera_mode == self.FIRST_PERSON:
-                print("Starting in first-person mode")
+                _log.debug("Starting in first-person mode")
                 self.set_first_person_mode()
             else:
-                print("Starting in third-person mode")
+                _log.debug("Starting in third-person mode")
                 self.set_third_person_mode()
 
             self.update_camera_position()
 
-        self.camera_task = self.taskMgr.add(self._update_camera, "updateCameraTask", priority=-5)
+        # Between ShowBase's collisionLoop (sort 30) and igLoop (sort 50), so each frame is
+        # rendered from this frame's player position.
+        self.camera_task = self.taskMgr.add(self._update_camera, "updateCameraTask", sort=40)
 
-        print("Camera system setup complete.")
+        _log.debug("Camera system setup complete.")
         return self.camera_task
 
     def set_fov(self, fov_value):
@@ -122,12 +184,12 @@ class CameraController:
         try:
             main_cam_np = self.app.cam
             if not main_cam_np or main_cam_np.isEmpty():
-                 print("Error: Cannot set FOV, self.app.cam is invalid.")
+                 _log.error("Cannot set FOV, self.app.cam is invalid.")
                  return
 
             cam_node = main_cam_np.node()
             if not isinstance(cam_node, LensNode) or not cam_node.getLens():
-                 print(f"Error: Cannot set FOV, self.app.cam node ({type(cam_node)}) is not a valid LensNode with a Lens.")
+                 _log.error("Cannot set FOV, self.app.cam node (%s) is not a valid LensNode with a Lens.", type(cam_node))
                  return
 
             clamped_fov = max(self.min_fov, min(self.max_fov, float(fov_value)))
@@ -137,19 +199,19 @@ class CameraController:
                 lens.setFov(clamped_fov)
                 self.current_fov = clamped_fov
             else:
-                print(f"Warning: Camera lens is not a PerspectiveLens (type: {type(lens)}). Cannot set FOV.")
+                _log.warning("Camera lens is not a PerspectiveLens (type: %s). Cannot set FOV.", type(lens))
 
         except (AttributeError, ValueError, TypeError, Exception) as e:
-            print(f"Error setting FOV to {fov_value}: {e}")
-            print(f"  Debug Info:")
-            print(f"    self.app: {self.app}")
-            if self.app:
-                print(f"    self.app.cam: {self.app.cam}")
-                if self.app.cam and not self.app.cam.isEmpty():
-                     print(f"    self.app.cam.node type: {type(self.app.cam.node())}")
-                print(f"    self.camera (CameraController's variable): {self.camera}")
-                if self.camera and not self.camera.isEmpty():
-                     print(f"    self.camera.node type: {type(self.camera.node())}")
+            _log.error("Error setting FOV to %s: %s", fov_value, e)
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("  self.app: %s", self.app)
+                if self.app:
+                    _log.debug("  self.app.cam: %s", self.app.cam)
+                    if self.app.cam and not self.app.cam.isEmpty():
+                        _log.debug("  self.app.cam.node type: %s", type(self.app.cam.node()))
+                    _log.debug("  self.camera (CameraController's variable): %s", self.camera)
+                    if self.camera and not self.camera.isEmpty():
+                        _log.debug("  self.camera.node type: %s", type(self.camera.node()))
 
     def toggle_camera_mode(self):
         """Toggle between first-person and third-person camera modes."""
@@ -165,7 +227,7 @@ class CameraController:
         self.settings_manager.save_settings()
 
         camera_mode_name = "First-Person" if self.camera_mode == self.FIRST_PERSON else "Third-Person"
-        print(f"Camera mode changed to {camera_mode_name}")
+        _log.debug("Camera mode changed to %s", camera_mode_name)
 
     def set_first_person_mode(self):
         """Switch to first-person camera mode."""
@@ -212,44 +274,51 @@ class CameraController:
 
     def _update_camera(self, task):
         """Task to update camera position and orientation based on mouse input and player position."""
-        if (self.app.game_paused or not self.player or not self.player.player_root
-            or self.player.player_root.isEmpty()):
+        player = self.player
+        if not self.app.sim_running or not player:
             return Task.cont
-
-        if self.camera_mode == self.THIRD_PERSON and (not self.cam_pivot or self.cam_pivot.isEmpty()):
+        player_root = player.player_root
+        if not player_root or player_root.isEmpty():
             return Task.cont
 
-        heading_changed = False
-        pitch_changed = False
+        camera_mode = self.camera_mode
+        cam_pivot = self.cam_pivot
+        if camera_mode == self.THIRD_PERSON and (not cam_pivot or cam_pivot.isEmpty()):
+            return Task.cont
 
-        if self.app.mouseWatcherNode.hasMouse():
-            md = self.app.mouseWatcherNode.getMouse()
+        mouse_watcher = self.app.mouseWatcherNode
+        if mouse_watcher.hasMouse():
+            md = mouse_watcher.getMouse()
             dx = md.getX()
             dy = md.getY()
 
-            sensitivity = self.settings_manager.get_effective_sensitivity()
-
-            if abs(dx) > self.mouse_dead_zone:
-                heading_delta = dx * sensitivity * 0.5
-                self.cam_heading = (self.cam_heading - heading_delta) % 360
-                heading_changed = True
-
-                if self.camera_mode == self.FIRST_PERSON:
-                    self.player.player_root.setH(self.cam_heading)
-
-            if abs(dy) > self.mouse_dead_zone:
-                pitch_delta = dy * sensitivity * 0.5 * (-1 if self.camera_mode == self.THIRD_PERSON else 1)
-
-                self.cam_pitch += pitch_delta
-                self.cam_pitch = max(self.cam_min_pitch, min(self.cam_max_pitch, self.cam_pitch))
-                pitch_changed = True
-
-            if (heading_changed or pitch_changed) and self.app.win:
-                props = self.app.win.getProperties()
-                if props.hasSize():
-                    self.app.win.movePointer(0,
-                                        int(props.getXSize() / 2),
-                                        int(props.getYSize() / 2))
+            sensitivity = self._sensitivity_cache
+            if sensitivity is None:
+                sensitivity = self._sensitivity_cache = self.settings_manager.get_effective_sensitivity()
+
+            if dx * dx + dy * dy > self._dead_sq:
+                half_sens = sensitivity * 0.5
+                # dx is bounded by the window, so one wrap step nearly always suffices.
+                heading = self.cam_heading - dx * half_sens
+                if heading >= 360.0:
+                    heading -= 360.0
+                elif heading < 0.0:
+                    heading += 360.0
+                if not 0.0 <= heading < 360.0:
+                    heading %= 360.0
+                self.cam_heading = heading
+                if camera_mode == self.FIRST_PERSON:
+                    player_root.setH(self.cam_heading)
+
+                pitch_delta = dy * half_sens * (-1 if camera_mode == self.THIRD_PERSON else 1)
+                self.cam_pitch = max(self.cam_min_pitch, min(self.cam_max_pitch, self.cam_pitch + pitch_delta))
+
+                win = self.app.win
+                if win:
+                    if self._win_cx is None:
+                        self._on_window_event(win)
+                    if self._win_cx is not None:
+                        win.movePointer(0, self._win_cx, self._win_cy)
 
         self.update_camera_position()
 
@@ -270,74 +339,94 @@ class CameraController:
         if not self.player or not self.player.player_root:
              return
 
-        player_pos = self.player.player_root.getPos(self.render)
+        player_pos = self._get_player_pos()
 
-        cam_pos = Point3(player_pos.x, player_pos.y, player_pos.z + self.fp_head_height)
-
-        self.camera.setPos(cam_pos)
-        self.camera.setHpr(self.cam_heading, self.cam_pitch, 0)
+        # The camera is a direct child of render, so parent space is render space.
+        self.camera.setPosHpr(player_pos.x, player_pos.y, player_pos.z + self.fp_head_height,
+                              self.cam_heading, self.cam_pitch, 0)
 
     def _update_third_person_camera(self):
         """Position camera for third-person view with collision detection."""
-        if not self.cam_pivot or self.cam_pivot.isEmpty() or not self.player or not self.player.player_root:
+        cam_pivot = self.cam_pivot
+        if not cam_pivot or cam_pivot.isEmpty() or not self.player or not self.player.player_root:
             return
 
-        player_pos = self.player.player_root.getPos(self.render)
-        self.cam_pivot.setPos(player_pos)
-        self.cam_pivot.setH(self.cam_heading)
-
-        distance_smoothing = 0.1
-        self.cam_dist = self.cam_dist + (self.cam_target_dist - self.cam_dist) * distance_smoothing
-
-        rad_pitch = math.radians(self.cam_pitch)
-        cam_offset_y = -self.cam_dist * math.cos(rad_pitch)
-        cam_offset_z = self.cam_dist * math.sin(rad_pitch)
-        ideal_cam_pos_rel = Point3(0, cam_offset_y, cam_offset_z)
-        ideal_cam_pos_world = self.render.getRelativePoint(self.cam_pivot, ideal_cam_pos_rel)
-
-        cam_look_at_pos = player_pos + Point3(0, 0, self.cam_lookat_height)
-        final_cam_pos = ideal_cam_pos_world
-
-        self.cam_coll_ray.setOrigin(cam_look_at_pos)
-        direction_vector = ideal_cam_pos_world - cam_look_at_pos
-        if direction_vector.lengthSquared() > 0.001:
-            self.cam_coll_ray.setDirection(direction_vector.normalized())
-        else:
-            self.cam_coll_ray.setDirection(Vec3(0, -1, 0))
-
-        self.cam_coll_traverser.traverse(self.render)
-
-        actual_cam_dist = self.cam_dist
-        if self.cam_coll_handler.getNumEntries() > 0:
-            self.cam_coll_handler.sortEntries()
-            hit_entry = self.cam_coll_handler.getEntry(0)
-            hit_dist_sq = (hit_entry.getSurfacePoint(self.render) - cam_look_at_pos).lengthSquared()
-            ideal_dist_sq = direction_vector.lengthSquared()
-
-            if hit_dist_sq < ideal_dist_sq - 0.01:
-                hit_pos = hit_entry.getSurfacePoint(self.render)
+        render = self.render
+
+        # Both cam_pivot and the camera are direct children of render (see setup), so
+        # render-space values are set in parent space without composing a relative transform.
+        player_pos = self._get_player_pos()
+        px, py, pz = player_pos.x, player_pos.y, player_pos.z
+        cam_pivot.setPosHpr(px, py, pz, self.cam_heading, 0, 0)
+
+        cam_min_dist = self.cam_min_dist
+        lookat_h = self.cam_lookat_height
+
+        cam_heading = self.cam_heading
+        if cam_heading != self._last_heading:
+            rad_heading = math.radians(cam_heading)
+            self._sin_heading = math.sin(rad_heading)
+            self._cos_heading = math.cos(rad_heading)
+            self._last_heading = cam_heading
+
+        # Rotates the pivot-space offset by the heading directly instead of resolving the
+        # pivot's net transform through getRelativePoint.
+        # When the view is idle the inputs repeat exactly (the distance smoothing settles on a
+        # fixed point), so reuse the last result and skip the trig/sqrt/atan2 entirely.
+        math_key = (self.cam_dist, self.cam_target_dist, self.cam_pitch, cam_heading, lookat_h)
+        if math_key != self._tp_math_key:
+            self._tp_math_key = math_key
+            self._tp_math_result = compute_third_person(
+                self.cam_dist, self.cam_target_dist, self.cam_pitch,
+                self._sin_heading, self._cos_heading, lookat_h
+            )
+        cam_dist, look_pitch, dir_x, dir_y, dir_z, dir_len_sq = self._tp_math_result
+        self.cam_dist = cam_dist
+
+        cam_look_at_pos = self._scratch_look
+        cam_look_at_pos.set(px, py, pz + lookat_h)
+
+        norm_dir = self._scratch_dir
+        norm_dir.set(dir_x, dir_y, dir_z)
+        actual_cam_dist = cam_dist
+
+        cam_coll_ray = self.cam_coll_ray
+        cam_coll_ray.setOrigin(cam_look_at_pos)
+        cam_coll_ray.setDirection(norm_dir)
+
+        cam_coll_handler = self.cam_coll_handler
+        if cam_coll_handler.getNumEntries() > 0:
+            cam_coll_handler.sortEntries()
+            hit_entry = cam_coll_handler.getEntry(0)
+            hit_dist_sq = (hit_entry.getSurfacePoint(render) - cam_look_at_pos).lengthSquared()
+            if hit_dist_sq < dir_len_sq - 0.01:
+                hit_pos = hit_entry.getSurfacePoint(render)
                 hit_vector = hit_pos - cam_look_at_pos
-                actual_cam_dist = max(self.cam_min_dist, hit_vector.length() * 0.95)
-
-        actual_cam_dist = max(self.cam_min_dist, actual_cam_dist)
-        final_direction = direction_vector.normalized() if direction_vector.lengthSquared() > 0.001 else Vec3(0,-1,0)
-        final_cam_pos = cam_look_at_pos + final_direction * actual_cam_dist
-
-
-        self.camera.setPos(final_cam_pos)
-        self.camera.lookAt(cam_look_at_pos)
+                actual_cam_dist = max(cam_min_dist, hit_vector.length() * 0.95)
+
+        actual_cam_dist = max(cam_min_dist, actual_cam_dist)
+        final_cam_pos = self._scratch_final
+        final_cam_pos.set(px + dir_x * actual_cam_dist,
+                          py + dir_y * actual_cam_dist,
+                          pz + lookat_h + dir_z * actual_cam_dist)
+        if dir_len_sq > 0.001:
+            # The camera sits on the ray from the look-at point, so its orientation follows
+            # directly from the pivot angles; no need for lookAt to rebuild it from two points.
+            self.camera.setPosHpr(final_cam_pos.x, final_cam_pos.y, final_cam_pos.z,
+                                  cam_heading, look_pitch, 0)
+        else:
+            self.camera.setPos(final_cam_pos)
+            self.camera.lookAt(cam_look_at_pos)
 
     def cleanup(self):
         """Clean up camera resources."""
-        print("Cleaning up camera system...")
+        _log.debug("Cleaning up camera system...")
         if hasattr(self, 'camera_task') and self.camera_task:
             self.taskMgr.remove(self.camera_task)
             self.camera_task = None
 
-        if hasattr(self, 'cam_coll_traverser') and self.cam_coll_traverser:
-            self.cam_coll_traverser.clearColliders()
-
         if hasattr(self, 'cam_coll_np') and self.cam_coll_np and not self.cam_coll_np.isEmpty():
+            self.app.remove_collider_from_main_traverser(self.cam_coll_np)
             self.cam_coll_np.removeNode()
             self.cam_coll_np = None
 
@@ -346,5 +435,8 @@ class CameraController:
             self.cam_pivot = None
 
         self.player = None
+        self._sensitivity_cache = None
+        self._last_player_transform = None
+        self._last_player_pos = None
 
-        print("Camera system cleanup complete.")
\ No newline at end of file
+        _log.debug("Camera system cleanup complete.")
\ No newline at end of file
@@ -1,12 +1,22 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from panda3d.core import NodePath
+from direct.showbase.DirectObject import DirectObject
 from .static_generators.manager import StaticEnvironmentManager
 from .reactive_manager import ReactiveManager
+from .player import CHUNK_BOUNDARY_EVENT
+
+_log = logging.getLogger(__name__)
 
 class EnvironmentManager:
     """
     Top-level manager for the game environment, responsible for initializing
     static and reactive components.
     """
+    POPULATE_FRAME_BUDGET = 0.004  # seconds of population work per frame
+    CHUNK_WORKERS = 2  # threads building terrain chunk arrays in the background
+    CHUNK_BUILD_RETRIES = 2  # resubmissions of a chunk whose build raised before giving up
     def __init__(self, app):
         self.app = app
         self.render = app.render
@@ -20,48 +30,114 @@ class EnvironmentManager:
 
         self.player = None
 
-        self.terrain_update_task = self.app.taskMgr.add(
-            self._update_terrain_chunks, "update_terrain_chunks_task"
-        )
+        # Terrain is only re-streamed when the player reports entering a new chunk
+        self._terrain_generator = self.static_manager.terrain_generator
+        self._chunk_size = self._terrain_generator.chunk_size if self._terrain_generator else 16
+        # Reactive elements past the loaded terrain are hidden on the same schedule
+        view_distance = self._terrain_generator.view_distance if self._terrain_generator else 3
+        self._element_cull_distance = (view_distance + 1) * self._chunk_size
+
+        self._events = DirectObject()
+        self._events.accept(CHUNK_BOUNDARY_EVENT, self._on_chunk_crossed)
+
+        # Chunk arrays are built on worker threads; only the scene graph attach
+        # happens on the main thread, in _attach_finished_chunks.
+        self._chunk_pool = ThreadPoolExecutor(max_workers=self.CHUNK_WORKERS,
+                                              thread_name_prefix="terrain_chunk")
+        self._pending_chunks = {}  # (chunk_x, chunk_y) -> Future
+        self._chunk_retries = {}  # (chunk_x, chunk_y) -> resubmissions so far
+        self.app.taskMgr.add(self._attach_finished_chunks, "attachTerrainChunksTask")
 
+        # Reactive elements are created over several frames so starting a game doesn't hitch.
         num_elements_to_create = 0
-        self.reactive_manager.populate_reactive_elements(
+        self._populator = self.reactive_manager.iter_populate_reactive_elements(
             self.static_manager,
             num_elements=num_elements_to_create
         )
+        self.populate_task = self.app.taskMgr.add(self._populate_step, "envPopulateTask")
 
-        print("EnvironmentManager initialized.")
+        _log.debug("EnvironmentManager initialized.")
 
-    def _update_terrain_chunks(self, task):
-        """Task that updates visible terrain chunks based on player position"""
-        if (self.app.game_paused or not self.app.game_active or 
-            not hasattr(self, 'static_manager') or 
-            not self.static_manager or
-            not hasattr(self.static_manager, 'terrain_generator') or
-            not self.static_manager.terrain_generator):
-            return task.cont
-        
-        # Get player position
-        player_pos = None
-        if self.player and hasattr(self.player, 'player_root') and self.player.player_root:
-            player_pos = self.player.player_root.getPos(self.render)
-        
-        # Update terrain chunks if player position available
-        if player_pos:
-            self.static_manager.terrain_generator.update_visible_chunks(player_pos)
-        
-        # Run this task every 0.5 seconds
-        return task.again
+    def _on_chunk_crossed(self, player_pos):
+        """Handler for CHUNK_BOUNDARY_EVENT, sent by the player on entering a new chunk"""
+        if self._terrain_generator:
+            self._refresh_around(player_pos, background=True)
     
+    def _refresh_around(self, player_pos, background=False):
+        """
+        Update terrain chunks and reactive element visibility around player_pos.
+        With background=True missing chunks are queued on the worker pool instead
+        of being built before returning.
+        """
+        terrain_generator = self._terrain_generator
+        if background:
+            # Plan first: it replaces visible_chunks, which the cancel pass compares against
+            missing_chunks = terrain_generator.plan_visible_chunks(player_pos)
+            for chunk_key, future in list(self._pending_chunks.items()):
+                if chunk_key not in terrain_generator.visible_chunks and future.cancel():
+                    del self._pending_chunks[chunk_key]
+                    self._chunk_retries.pop(chunk_key, None)
+            for chunk_key in missing_chunks:
+                if chunk_key not in self._pending_chunks:
+                    self._submit_chunk(chunk_key)
+        else:
+            terrain_generator.update_visible_chunks(player_pos)
+        if self.reactive_manager:
+            self.reactive_manager.update_element_visibility(player_pos, self._element_cull_distance)
+    
+    def _submit_chunk(self, chunk_key):
+        """Queue build_chunk_data for chunk_key on the worker pool"""
+        self._pending_chunks[chunk_key] = self._chunk_pool.submit(
+            self._terrain_generator.build_chunk_data, *chunk_key
+        )
+
+    def _attach_finished_chunks(self, task):
+        """Task that adds chunks finished by the worker pool to the scene graph"""
+        if not self._pending_chunks:
+            return task.cont
+        terrain_generator = self._terrain_generator
+        for chunk_key in [key for key, future in self._pending_chunks.items() if future.done()]:
+            future = self._pending_chunks.pop(chunk_key)
+            if future.cancelled() or chunk_key not in terrain_generator.visible_chunks:
+                self._chunk_retries.pop(chunk_key, None)
+                continue
+            try:
+                terrain_generator.attach_chunk(chunk_key, future.result())
+            except Exception:
+                # A missing chunk has no ground under it, so try again before giving up
+                retries = self._chunk_retries.get(chunk_key, 0)
+                if retries < self.CHUNK_BUILD_RETRIES:
+                    _log.warning("Failed to build terrain chunk %s, retrying", chunk_key, exc_info=True)
+                    self._chunk_retries[chunk_key] = retries + 1
+                    self._submit_chunk(chunk_key)
+                    continue
+                _log.exception("Failed to build terrain chunk %s after %d retries", chunk_key, retries)
+            self._chunk_retries.pop(chunk_key, None)
+        return task.cont
+
+    def _populate_step(self, task):
+        """Task that advances reactive element population within a per-frame time budget"""
+        if self._populator is None:
+            return task.done
+        start = time.perf_counter()
+        while time.perf_counter() - start < self.POPULATE_FRAME_BUDGET:
+            try:
+                next(self._populator)
+            except StopIteration:
+                self._populator = None
+                return task.done
+        return task.cont
+
     def set_player(self, player):
         """Set the player reference for terrain updates"""
         self.player = player
         
         # Force an initial terrain update
-        if (self.player and hasattr(self.static_manager, 'terrain_generator') and 
-            self.static_manager.terrain_generator):
-            player_pos = self.player.player_root.getPos(self.render)
-            self.static_manager.terrain_generator.update_visible_chunks(player_pos)
+        if self.player and self._terrain_generator:
+            self.player.chunk_event_size = self._chunk_size
+            # The terrain is the only ground, and its height is known without casting a ray
+            self.player.set_ground_query(self._terrain_generator.ground_height_at)
+            self._refresh_around(self.player.player_root.getPos(self.render))
 
     def handle_collision_enter(self, entry):
         if self.reactive_manager:
@@ -72,7 +148,15 @@ class EnvironmentManager:
             self.reactive_manager.handle_collision_exit(entry)
 
     def cleanup(self):
-        print("Cleaning up EnvironmentManager...")
+        _log.debug("Cleaning up EnvironmentManager...")
+        self.app.taskMgr.remove("envPopulateTask")
+        self._events.ignoreAll()
+        self.app.taskMgr.remove("attachTerrainChunksTask")
+        self._chunk_pool.shutdown(wait=False, cancel_futures=True)
+        self._pending_chunks.clear()
+        self._chunk_retries.clear()
+        self._populator = None
+        self._terrain_generator = None
         if self.reactive_manager:
             self.reactive_manager.cleanup()
             self.reactive_manager = None
@@ -87,4 +171,4 @@ class EnvironmentManager:
             self.static_root.removeNode()
             self.static_root = None
 
-        print("EnvironmentManager cleanup complete.")
\ No newline at end of file
+        _log.debug("EnvironmentManager cleanup complete.")
\ No newline at end of file
@@ -1,22 +1,48 @@
-from collections import deque
 from panda3d.core import (
-    NodePath, Point3, Vec3, Vec4, BitMask32, Quat,
-    CollisionNode, CollisionCapsule, CollisionHandlerPusher,
+    NodePath, Point3, Vec3, Vec4, Quat,
+    CollisionNode, CollisionCapsule,
     CollisionRay, CollisionHandlerQueue, CollisionTraverser
 )
 from direct.task.Task import Task
 from direct.actor.Actor import Actor
 from direct.showbase.DirectObject import DirectObject
 from panda3d.core import ClockObject
+import logging
 import math
 from ..utils.geometry_utils import create_player_model
+from ..utils.settings import (
+    DEFAULT_GROUND_MASK, DEFAULT_PLAYER_MASK, DEFAULT_TRIGGER_MASK, DEFAULT_CAMERA_MASK, ALL_OFF_MASK
+)
+from ._player_math import compute_heading_step
+
+_log = logging.getLogger(__name__)
 
 globalClock = ClockObject.getGlobalClock()
 
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+# Fixed physics step; a frame's dt is integrated in steps no longer than this
+PHYSICS_STEP = 1.0 / 60.0
+
+# Verbose movement tracing; a module constant so disabled checks are a global load and
+# the per-frame _log.debug calls under it never even build their arguments
+DEBUG = False
+
+# Movement keys and the controller flag each one holds while pressed
+MOVE_KEY_MAP = (
+    ("w", "move_forward"),
+    ("s", "move_backward"),
+    ("a", "strafe_left"),
+    ("d", "strafe_right"),
+)
+
+# Sent with the player's world position whenever it enters a different terrain chunk
+CHUNK_BOUNDARY_EVENT = 'chunk-boundary-crossed'
+
 class PlayerController(DirectObject):
 
     def __init__(self, app):
-        print("Initializing PlayerController...")
+        _log.debug("Initializing PlayerController...")
         self.app = app
         self.render = app.render
         self.taskMgr = app.taskMgr
@@ -26,13 +52,18 @@ class PlayerController(DirectObject):
 
         self.player_root = self.render.attachNewNode("PlayerRoot")
         self.player_root.setPos(0, 0, 5.0)
-        print(f"PlayerRoot (Physics Root at Feet) created at {self.player_root.getPos()}")
+        _log.debug("PlayerRoot (Physics Root at Feet) created at %s", self.player_root.getPos())
 
         self.player_model, self.player_anims = create_player_model("PlayerVisualModel")
         if not self.player_model:
             raise RuntimeError("failed to load player model")
         
         self.player_model.reparentTo(self.player_root)
+        # Resolved once; neither the model type nor its animation list changes afterwards.
+        if isinstance(self.player_model, Actor) and self.player_anims:
+            self._walk_anim = self.player_anims[0]
+        else:
+            self._walk_anim = None
         self.move_speed = 5.0
         self.sprint_multiplier = 1.7  # Sprint speed multiplier
         self.dash_force = 15.0  # Dash speed
@@ -52,18 +83,17 @@ class PlayerController(DirectObject):
         self.strafe_left = False
         self.strafe_right = False
         self.is_walking = False
+        # Camera yaw basis, recomputed only when the camera heading changes
+        self._basis_h = 0.0
+        self._basis_sin_cos = (0.0, 1.0)
 
         self.collider_node = None
         self.collider_np = None
-        self.pusher = None
         self.ground_ray_node = None
         self.ground_ray_np = None
         self.ground_handler = None
         self._setup_collision()
 
-        self.dt_buffer_size = 5
-        self.dt_buffer = deque([1.0/60.0] * self.dt_buffer_size, maxlen=self.dt_buffer_size)
-
         self.jump_force = self.player_consts.get('JUMP_FORCE', 8.0)
         self.gravity = self.player_consts.get('GRAVITY', 20.0)
         self.vertical_velocity = 0.0
@@ -71,23 +101,33 @@ class PlayerController(DirectObject):
         self.air_time = 0.0
         self.ground_check_dist = self.player_consts.get('GROUND_CHECK_DIST', 0.3)
         self.jump_cooldown = 0
-        self.debug_mode = True
+        # Cleared while the player rests on the ground with nothing left to integrate
+        self._awake = True
+        # Ground Z recorded on going to sleep; stands in for the ray until it has run again
+        self._rest_ground_z = None
+
+        # Set through set_ground_query; None falls back to the ground ray
+        self.ground_height_at = None
+        # Set by the environment; None disables CHUNK_BOUNDARY_EVENT
+        self.chunk_event_size = None
+        self._last_chunk = None
 
         self._setup_input()
 
         self.taskMgr.add(self._update_movement, "playerMoveTask", sort=20)
 
-        print("PlayerController initialized.")
+        _log.debug("PlayerController initialized.")
 
     def _setup_collision(self):
-        print("Setting up player collision...")
+        _log.debug("Setting up player collision...")
         player_tag = self.collision_consts.get('TAG_PLAYER', 'Player')
         player_height = self.player_consts.get('HEIGHT', 1.8)
         player_radius = self.player_consts.get('RADIUS', 0.4)
-        mask_player = self.collision_consts.get('MASK_PLAYER', BitMask32(2))
-        mask_ground = self.collision_consts.get('MASK_GROUND', BitMask32(1))
-        mask_trigger = self.collision_consts.get('MASK_REACTIVE_TRIGGER', BitMask32(4))
-        mask_camera = self.collision_consts.get('MASK_CAMERA', BitMask32(8))
+        mask_player = self.collision_consts.get('MASK_PLAYER', DEFAULT_PLAYER_MASK)
+        mask_ground = self.collision_consts.get('MASK_GROUND', DEFAULT_GROUND_MASK)
+        self._mask_ground = mask_ground
+        mask_trigger = self.collision_consts.get('MASK_REACTIVE_TRIGGER', DEFAULT_TRIGGER_MASK)
+        mask_camera = self.collision_consts.get('MASK_CAMERA', DEFAULT_CAMERA_MASK)
         default_ground_check_dist = self.player_consts.get('GROUND_CHECK_DIST', 0.3)
 
         self.collider_node = CollisionNode(player_tag)
@@ -98,14 +138,11 @@ class PlayerController(DirectObject):
         )
         self.collider_node.addSolid(capsule_shape)
         self.collider_node.setFromCollideMask(mask_player)
-        self.collider_node.setIntoCollideMask(mask_trigger | mask_camera)
-        self.collider_np = self.player_root.attachNewNode(self.collider_node)
-
-        self.pusher = CollisionHandlerPusher()
-        self.pusher.addCollider(self.collider_np, self.player_root)
         self.collider_node.setIntoCollideMask(mask_trigger | mask_camera | mask_ground)
+        self.collider_np = self.player_root.attachNewNode(self.collider_node)
 
-        self.app.add_collider_to_main_traverser(self.collider_np, self.pusher)
+        # A traverser keeps one handler per collider, so the capsule is registered once, with
+        # the trigger event handler; ground contact comes from the ray below.
         self.app.add_collider_to_main_traverser(self.collider_np, self.app.event_handler)
 
         self.ground_ray_node = CollisionNode('player-ground-ray')
@@ -117,7 +154,7 @@ class PlayerController(DirectObject):
         self.ground_ray_node.addSolid(ray_shape)
 
         self.ground_ray_node.setFromCollideMask(mask_ground)
-        self.ground_ray_node.setIntoCollideMask(BitMask32(0))
+        self.ground_ray_node.setIntoCollideMask(ALL_OFF_MASK)
 
         self.ground_ray_np = self.player_root.attachNewNode(self.ground_ray_node)
         # self.ground_ray_np.show()
@@ -125,24 +162,19 @@ class PlayerController(DirectObject):
         self.ground_handler = CollisionHandlerQueue()
         self.app.add_collider_to_main_traverser(self.ground_ray_np, self.ground_handler)
 
-        print("Player collision setup complete.")
-        print(f"  Capsule: Z={player_radius:.2f} to Z={player_height - player_radius:.2f}, R={player_radius:.2f}")
-        print(f"  Ground Ray: Starts at Z={self.ray_start_z_offset:.2f} relative to root (feet)")
-        print(f"  Ground Check Distance Threshold: {self.ground_check_dist:.2f}")
-        print(f"  Pusher Into Mask: {self.collider_node.getIntoCollideMask()}")
-        print(f"  Ground Ray From Mask: {self.ground_ray_node.getFromCollideMask()}")
+        _log.debug("Player collision setup complete.")
+        _log.debug("  Capsule: Z=%.2f to Z=%.2f, R=%.2f", player_radius, player_height - player_radius, player_radius)
+        _log.debug("  Ground Ray: Starts at Z=%.2f relative to root (feet)", self.ray_start_z_offset)
+        _log.debug("  Ground Check Distance Threshold: %.2f", self.ground_check_dist)
+        _log.debug("  Capsule Into Mask: %s", self.collider_node.getIntoCollideMask())
+        _log.debug("  Ground Ray From Mask: %s", self.ground_ray_node.getFromCollideMask())
 
 
     def _setup_input(self):
-        print("Setting up player input...")
-        self.accept("w", self._set_move_state, ["forward", True])
-        self.accept("w-up", self._set_move_state, ["forward", False])
-        self.accept("s", self._set_move_state, ["backward", True])
-        self.accept("s-up", self._set_move_state, ["backward", False])
-        self.accept("a", self._set_move_state, ["strafe_left", True])
-        self.accept("a-up", self._set_move_state, ["strafe_left", False])
-        self.accept("d", self._set_move_state, ["strafe_right", True])
-        self.accept("d-up", self._set_move_state, ["strafe_right", False])
+        _log.debug("Setting up player input...")
+        for key, flag in MOVE_KEY_MAP:
+            self.accept(key, self._set_move_state, [flag, True])
+            self.accept(f"{key}-up", self._set_move_state, [flag, False])
         self.accept("space", self.jump)
         
         # Add sprinting (hold ctrl) inputs
@@ -152,44 +184,44 @@ class PlayerController(DirectObject):
         # Add dash (press shift) input
         self.accept("shift", self.dash)
         
-        print("Player input setup complete.")
-
-    def _set_move_state(self, key, is_down):
-        if key == "forward": self.move_forward = is_down
-        elif key == "backward": self.move_backward = is_down
-        elif key == "strafe_left": self.strafe_left = is_down
-        elif key == "strafe_right": self.strafe_right = is_down
+        _log.debug("Player input setup complete.")
+
+    def _set_move_state(self, flag, is_down):
+        self._wake()
+        setattr(self, flag, is_down)
+
+    def _wake(self):
+        """Resumes integration and the ground ray after a rest."""
+        if not self._awake:
+            self._awake = True
+            if self.ground_height_at is None:
+                self.ground_ray_node.setFromCollideMask(self._mask_ground)
     
     def _set_sprint_state(self, is_down):
         """Set the sprint state based on ctrl key state"""
         self.is_sprinting = is_down
-        if self.debug_mode and is_down:
-            print("Sprinting activated")
-        elif self.debug_mode:
-            print("Sprinting deactivated")
+        if DEBUG and is_down:
+            _log.debug("Sprinting activated")
+        elif DEBUG:
+            _log.debug("Sprinting deactivated")
     
     def dash(self):
         """Initiates a dash in the current movement direction"""
+        self._wake()
         if self.current_dash_cooldown > 0:
-            if self.debug_mode:
-                print(f"Dash on cooldown: {self.current_dash_cooldown:.2f} seconds remaining")
+            if DEBUG:
+                _log.debug("Dash on cooldown: %.2f seconds remaining", self.current_dash_cooldown)
             return
             
         # Calculate dash direction based on current movement or facing direction
         dash_direction = Vec3(0)
-        if self.app.camera:
-            cam_quat = self.app.camera.getQuat(self.render)
-            cam_forward = cam_quat.getForward()
-            cam_right = cam_quat.getRight()
-            cam_forward.z = 0
-            cam_right.z = 0
-            cam_forward.normalize()
-            cam_right.normalize()
-
-            if self.move_forward: dash_direction += cam_forward
-            if self.move_backward: dash_direction -= cam_forward
-            if self.strafe_left: dash_direction -= cam_right
-            if self.strafe_right: dash_direction += cam_right
+        forward_coef = self.move_forward - self.move_backward
+        right_coef = self.strafe_right - self.strafe_left
+        if self.app.camera and (forward_coef or right_coef):
+            cam_h = math.radians(self.app.camera.getH(self.render))
+            sin_h, cos_h = math.sin(cam_h), math.cos(cam_h)
+            dash_direction = Vec3(cos_h * right_coef - sin_h * forward_coef,
+                                  sin_h * right_coef + cos_h * forward_coef, 0)
         
         # If no movement keys pressed, dash forward
         if dash_direction.lengthSquared() < 0.01:
@@ -205,35 +237,39 @@ class PlayerController(DirectObject):
             self.dash_timer = self.dash_duration
             self.current_dash_cooldown = self.dash_cooldown
             
-            if self.debug_mode:
-                print(f"Dash initiated in direction: {dash_direction}")
+            if DEBUG:
+                _log.debug("Dash initiated in direction: %s", dash_direction)
 
     def jump(self):
         """Initiates a jump if the player is grounded."""
-        if self.debug_mode:
-            print(f"Jump button pressed. Is grounded: {self.is_grounded}, Cooldown: {self.jump_cooldown}, Sprinting: {self.is_sprinting}")
+        if DEBUG:
+            _log.debug("Jump button pressed. Is grounded: %s, Cooldown: %s, Sprinting: %s", self.is_grounded, self.jump_cooldown, self.is_sprinting)
         
         if self.is_grounded and self.jump_cooldown <= 0:
-            if self.debug_mode:
-                print(f"Starting jump with force: {self.jump_force}")
+            if DEBUG:
+                _log.debug("Starting jump with force: %s", self.jump_force)
             
             # Apply additional jump force when sprinting
             jump_force = self.jump_force
             if self.is_sprinting:
                 jump_force *= 1.2  # Optional: Give a bit more height to sprint jumps
-                if self.debug_mode:
-                    print(f"Sprint jump with increased force: {jump_force}")
+                if DEBUG:
+                    _log.debug("Sprint jump with increased force: %s", jump_force)
             
             self.vertical_velocity = jump_force
             self.is_grounded = False
+            self._wake()
             
             self.player_root.setZ(self.player_root.getZ() + 0.2)
             self.jump_cooldown = 5
+            # Ground hits are ignored during the cooldown, so don't let the traverser cast the ray
+            if self.ground_height_at is None:
+                self.ground_ray_node.setFromCollideMask(ALL_OFF_MASK)
             
             self.air_time = 0.0
-            if self.debug_mode:
-                print(f"Set vertical velocity to: {self.vertical_velocity}")
-                print(f"Initial position: {self.player_root.getZ():.2f}")
+            if DEBUG:
+                _log.debug("Set vertical velocity to: %s", self.vertical_velocity)
+                _log.debug("Initial position: %.2f", self.player_root.getZ())
 
     def _check_ground(self):
         """
@@ -242,181 +278,266 @@ class PlayerController(DirectObject):
                  is_grounded: Boolean indicating if ground is detected within range.
                  ground_z_world: The Z coordinate of the hit ground in world space, or None.
         """
-        if not self.ground_handler or not self.ground_ray_np:
+        ground_height_at = self.ground_height_at
+        if ground_height_at is not None:
+            pos = self.player_root.getPos()
+            ground_z = ground_height_at(pos.x, pos.y)
+            # A heightfield is solid below its surface, so sinking under it still counts
+            if ground_z is not None and pos.z + self.ray_start_z_offset - ground_z < self.ground_check_dist:
+                return True, ground_z
             return False, None
 
-        num_entries = self.ground_handler.getNumEntries()
+        handler = self.ground_handler
+        ray_np = self.ground_ray_np
+        if not handler or not ray_np:
+            return False, None
+
+        num_entries = handler.getNumEntries()
+
+        # Woken this frame after the ray's traversal: reuse the height the player rested at
+        if num_entries == 0 and self._rest_ground_z is not None:
+            return True, self._rest_ground_z
 
         if num_entries > 0:
-            self.ground_handler.sortEntries()
-            ground_entry = self.ground_handler.getEntry(0)
+            render_np = self.render
+            # The ray points straight down, so the nearest hit is the highest one; a single
+            # scan finds it without sorting the queue.
+            ground_entry = handler.getEntry(0)
+            hit_z = ground_entry.getSurfacePoint(render_np).getZ()
+            for i in range(1, num_entries):
+                entry = handler.getEntry(i)
+                z = entry.getSurfacePoint(render_np).getZ()
+                if z > hit_z:
+                    ground_entry, hit_z = entry, z
             hit_node = ground_entry.getIntoNodePath().node()
 
-            mask_ground = self.collision_consts.get('MASK_GROUND', BitMask32(1))
-            if (hit_node.getIntoCollideMask() & mask_ground):
-                hit_pos_world = ground_entry.getSurfacePoint(self.render)
-                ray_origin_world = self.ground_ray_np.getPos(self.render)
-
-                hit_distance = ray_origin_world.getZ() - hit_pos_world.getZ()
+            if (hit_node.getIntoCollideMask() & self._mask_ground):
+                hit_distance = ray_np.getZ(render_np) - hit_z
 
                 if hit_distance < self.ground_check_dist:
-                    return True, hit_pos_world.getZ()
-
-        if self.vertical_velocity != 0:
-            ray_origin_world = self.ground_ray_np.getPos(self.render)
-            player_z = self.player_root.getZ()
+                    return True, hit_z
 
         return False, None
 
     def _update_movement(self, task):
-        if not self.app or self.app.game_paused or self.player_root.isEmpty():
+        app = self.app
+        player_root = self.player_root
+        if not app or app.game_paused or player_root.isEmpty():
             return Task.cont
 
-        raw_dt = globalClock.getDt()
-        if raw_dt == 0: return Task.cont
-        if raw_dt > 0.1: raw_dt = 0.1
-
-        self.dt_buffer.append(raw_dt)
-        dt = sum(self.dt_buffer) / len(self.dt_buffer)
+        if not self._awake:
+            return Task.cont
 
-        pos_before_update = self.player_root.getPos()
-        was_grounded = self.is_grounded
+        frame_dt = globalClock.getDt()
+        if frame_dt == 0: return Task.cont
+        if frame_dt > 0.1: frame_dt = 0.1
 
         # Update timers and cooldowns
         if self.jump_cooldown > 0:
             self.jump_cooldown -= 1
-            if self.debug_mode:
-                print(f"Jump cooldown: {self.jump_cooldown}, Height: {self.player_root.getZ():.2f}")
-        
+            if self.jump_cooldown == 0 and self.ground_height_at is None:
+                self.ground_ray_node.setFromCollideMask(self._mask_ground)
+            if DEBUG:
+                _log.debug("Jump cooldown: %s, Height: %.2f", self.jump_cooldown, player_root.getZ())
+
+        # Determine movement direction
+        # Opposite keys cancel; each axis coefficient is -1, 0 or 1
+        forward_coef = self.move_forward - self.move_backward
+        right_coef = self.strafe_right - self.strafe_left
+        camera = app.camera
+        is_moving = bool(forward_coef or right_coef) and bool(camera)
+        if is_moving:
+            # Only the camera's yaw steers movement: forward is (-sin h, cos h), right (cos h, sin h)
+            cam_h = camera.getH(self.render)
+            if cam_h != self._basis_h:
+                self._basis_h = cam_h
+                rad_h = math.radians(cam_h)
+                self._basis_sin_cos = (math.sin(rad_h), math.cos(rad_h))
+            sin_h, cos_h = self._basis_sin_cos
+            move_x = cos_h * right_coef - sin_h * forward_coef
+            move_y = sin_h * right_coef + cos_h * forward_coef
+            if forward_coef and right_coef:
+                move_x *= _INV_SQRT2
+                move_y *= _INV_SQRT2
+        else:
+            move_x = move_y = 0.0
+
+        # Turn the player model to face the movement direction
+        if is_moving and not self.is_dashing:
+            self.target_heading, new_h, turned = compute_heading_step(
+                player_root.getH(), move_x, move_y, self.turn_rate * frame_dt
+            )
+            # Already facing the movement direction: skip the transform update.
+            if turned:
+                player_root.setH(new_h)
+                self.current_heading = new_h
+
+        # Integrate in steps of at most PHYSICS_STEP; the last step takes the remainder,
+        # so results no longer depend on the render frame rate and nothing lags a frame.
+        step_physics = self._step_physics
+        remaining = frame_dt
+        while remaining > 1e-6:
+            dt = PHYSICS_STEP if remaining > PHYSICS_STEP else remaining
+            remaining -= dt
+            step_physics(dt, move_x, move_y, is_moving)
+        ray_ground = self.ground_height_at is None
+        if ray_ground:
+            self._rest_ground_z = None
+
+        if self.chunk_event_size:
+            self._check_chunk_boundary()
+
+        # Animation handling
+        walk_anim = self._walk_anim
+        if walk_anim is not None:
+            if is_moving:
+                if not self.is_walking:
+                    self.player_model.loop(walk_anim)
+                    self.is_walking = True
+            else:
+                if self.is_walking:
+                    self.player_model.stop(walk_anim)
+                    self.is_walking = False
+
+        # Resting: nothing changes until input arrives, so stop integrating until then.
+        if (not is_moving and self.is_grounded and self.vertical_velocity == 0
+                and self.jump_cooldown <= 0 and not self.is_dashing
+                and self.current_dash_cooldown <= 0):
+            # The ground can't change under a resting player, so stop casting the ray too
+            self._awake = False
+            if ray_ground:
+                self._rest_ground_z = player_root.getZ(self.render)
+                self.ground_ray_node.setFromCollideMask(ALL_OFF_MASK)
+
+        return Task.cont
+
+    def _step_physics(self, dt, move_x, move_y, is_moving):
+        """Advances dash timers, gravity, movement and ground contact by one step of dt."""
+        player_root = self.player_root
+        vertical_velocity = self.vertical_velocity
+        is_dashing = self.is_dashing
+        was_grounded = self.is_grounded
+
         # Update dash cooldown
         if self.current_dash_cooldown > 0:
             self.current_dash_cooldown -= dt
             if self.current_dash_cooldown < 0:
                 self.current_dash_cooldown = 0
-                if self.debug_mode:
-                    print("Dash cooldown reset - ready to dash again")
+                if DEBUG:
+                    _log.debug("Dash cooldown reset - ready to dash again")
         
         # Update dash timer if dashing
-        if self.is_dashing:
+        if is_dashing:
             self.dash_timer -= dt
             if self.dash_timer <= 0:
-                self.is_dashing = False
-                if self.debug_mode:
-                    print("Dash complete")
-
-        if not self.is_grounded or self.vertical_velocity > 0:
-            self.vertical_velocity -= self.gravity * dt
-
-        # Determine movement direction
-        move_direction = Vec3(0)
-        is_moving = False
-        if self.app.camera:
-            cam_quat = self.app.camera.getQuat(self.render)
-            cam_forward = cam_quat.getForward()
-            cam_right = cam_quat.getRight()
-            cam_forward.z = 0
-            cam_right.z = 0
-            cam_forward.normalize()
-            cam_right.normalize()
-
-            if self.move_forward: move_direction += cam_forward
-            if self.move_backward: move_direction -= cam_forward
-            if self.strafe_left: move_direction -= cam_right
-            if self.strafe_right: move_direction += cam_right
-
-            is_moving = move_direction.lengthSquared() > 0.01
-
-        # Turn the player model to face the movement direction
-        if is_moving and not self.is_dashing:
-            move_direction.normalize()
-            self.target_heading = math.degrees(math.atan2(-move_direction.x, move_direction.y))
-
-            current_h = self.player_root.getH()
-            delta_h = (self.target_heading - current_h + 180) % 360 - 180
-            max_turn = self.turn_rate * dt
-            turn_amount = max(-max_turn, min(max_turn, delta_h))
-            new_h = (current_h + turn_amount) % 360
-            self.player_root.setH(new_h)
-            self.current_heading = new_h
-
-        # Calculate horizontal movement
-        horizontal_move_delta = Vec3(0)
-        
-        # Dash takes precedence over normal movement
-        if self.is_dashing:
-            horizontal_move_delta = self.dash_direction * self.dash_force * dt
+                self.is_dashing = is_dashing = False
+                if DEBUG:
+                    _log.debug("Dash complete")
+
+        if not was_grounded or vertical_velocity > 0:
+            vertical_velocity -= self.gravity * dt
+
+        # Deltas are applied in place to the position copy getPos returns; no temporaries.
+        new_pos = player_root.getPos()
+        # Dash takes precedence over normal movement; the vertical part is gravity/jumping
+        if is_dashing:
+            step = self.dash_force * dt
+            direction = self.dash_direction
+            new_pos.x += direction.x * step
+            new_pos.y += direction.y * step
         elif is_moving:
             # Apply sprint multiplier if sprinting
             current_speed = self.move_speed
             if self.is_sprinting:
                 current_speed *= self.sprint_multiplier
-                
-            horizontal_move_delta = move_direction * current_speed * dt
-        else:
-            horizontal_move_delta = Vec3(0)
-
-        # Calculate vertical movement (gravity/jumping)
-        vertical_move_delta = Vec3(0, 0, self.vertical_velocity * dt)
-
-        # Combine movements
-        final_delta = horizontal_move_delta + vertical_move_delta
-        self.player_root.setPos(pos_before_update + final_delta)
+            step = current_speed * dt
+            new_pos.x += move_x * step
+            new_pos.y += move_y * step
+        new_pos.z += vertical_velocity * dt
+        # Fluid: the previous-frame transform is kept, so collision tests can sweep the move.
+        player_root.setFluidPos(new_pos)
 
         # Ground detection
-        if self.jump_cooldown > 0:
+        jump_cooldown = self.jump_cooldown
+        if jump_cooldown > 0:
             is_now_grounded = False
             ground_z_world = None
-            if self.debug_mode and self.vertical_velocity > 0:
-                print(f"Skipping ground check - jump cooldown active. Current height: {self.player_root.getZ():.2f}")
+            if DEBUG and vertical_velocity > 0:
+                _log.debug("Skipping ground check - jump cooldown active. Current height: %.2f", player_root.getZ())
         else:
             is_now_grounded, ground_z_world = self._check_ground()
 
         # Ground handling
         if is_now_grounded:
-            current_z = self.player_root.getZ()
-            z_diff = ground_z_world - current_z
-            if z_diff > 0.001 or (not was_grounded and self.vertical_velocity < 0):
-                 self.player_root.setZ(ground_z_world)
-                 if self.vertical_velocity < -0.1:
-                     pass
-
-            if self.vertical_velocity <= 0:
-                 self.vertical_velocity = 0
+            z_diff = ground_z_world - player_root.getZ()
+            if z_diff > 0.001 or (not was_grounded and vertical_velocity < 0):
+                 player_root.setZ(ground_z_world)
+
+            if vertical_velocity <= 0:
+                 vertical_velocity = 0
             self.is_grounded = True
             self.air_time = 0.0
         else:
-            if was_grounded and self.jump_cooldown <= 0:
+            if was_grounded and jump_cooldown <= 0:
                 self.air_time = 0.0
-                if self.vertical_velocity <= 0 and self.debug_mode:
-                     print(f"Left ground (walked off edge?). Vertical velocity: {self.vertical_velocity:.2f}")
+                if vertical_velocity <= 0 and DEBUG:
+                     _log.debug("Left ground (walked off edge?). Vertical velocity: %.2f", vertical_velocity)
             else:
                 self.air_time += dt
             self.is_grounded = False
 
-        # Animation handling
-        if isinstance(self.player_model, Actor):
-            walk_anim = self.player_anims[0]
-            if is_moving:
-                if not self.is_walking:
-                    self.player_model.loop(walk_anim)
-                    self.is_walking = True
-            else:
-                if self.is_walking:
-                    self.player_model.unloadAnims()
-                    self.is_walking = False
-        
-        return Task.cont
+        self.vertical_velocity = vertical_velocity
+
+    def _check_chunk_boundary(self):
+        """Send CHUNK_BOUNDARY_EVENT when the player's integer chunk coordinates change"""
+        pos = self.player_root.getPos(self.render)
+        size = self.chunk_event_size
+        chunk = (int(pos.x // size), int(pos.y // size))
+        if chunk != self._last_chunk:
+            self._last_chunk = chunk
+            self.app.messenger.send(CHUNK_BOUNDARY_EVENT, [pos])
+
+    def set_ground_query(self, height_at):
+        """
+        Answers ground checks with height_at(x, y) -> ground Z or None instead of the
+        collision ray, which is taken off the traverser; None restores the ray, which only
+        hits terrain built with TerrainGenerator.set_ground_collision(True)
+        """
+        self.ground_height_at = height_at
+        if height_at is not None:
+            self.app.remove_collider_from_main_traverser(self.ground_ray_np)
+        else:
+            # The query path leaves the ray's mask and rest height alone; start it clean
+            self._rest_ground_z = None
+            self.ground_ray_node.setFromCollideMask(self._mask_ground)
+            self.app.add_collider_to_main_traverser(self.ground_ray_np, self.ground_handler)
 
     def get_collider_nodepath(self):
         return self.collider_np
 
     def destroy(self):
-        print("Destroying PlayerController...")
+        """Takes the player out of the game now; node teardown runs on the next frame."""
+        _log.debug("Destroying PlayerController...")
         if self.taskMgr:
              self.taskMgr.remove("playerMoveTask")
         self.ignoreAll()
 
+        if self.app:
+            self.app.remove_collider_from_main_traverser(self.collider_np)
+            self.app.remove_collider_from_main_traverser(self.ground_ray_np)
+        if self.player_root and not self.player_root.isEmpty():
+            self.player_root.detachNode()
+
+        if self.taskMgr:
+            self.taskMgr.doMethodLater(0.0, self._finish_destroy, "playerDestroyTask")
+        else:
+            self._finish_destroy(None)
+
+    def _finish_destroy(self, task):
+        """Deferred half of destroy: unloads animations and removes the detached nodes."""
         if self.player_model and not self.player_model.isEmpty():
+            if self._walk_anim is not None:
+                self.player_model.unloadAnims()
             self.player_model.removeNode()
         if self.player_root and not self.player_root.isEmpty():
             self.player_root.removeNode()
@@ -425,11 +546,12 @@ class PlayerController(DirectObject):
         self.player_model = None
         self.collider_node = None
         self.collider_np = None
-        self.pusher = None
         self.ground_ray_node = None
         self.ground_ray_np = None
         self.ground_handler = None
+        self.ground_height_at = None
         self.app = None
         self.player_consts = None
         self.collision_consts = None
-        print("PlayerController destroyed.")
\ No newline at end of file
+        _log.debug("PlayerController destroyed.")
+        return Task.done
@@ -1,3 +1,4 @@
+import logging
 from panda3d.core import Vec3, Vec4, Point3
 from direct.interval.IntervalGlobal import (Sequence, Parallel, LerpFunc,
                                              LerpScaleInterval, LerpHprInterval,
@@ -6,6 +7,8 @@ from direct.interval.IntervalGlobal import (Sequence, Parallel, LerpFunc,
 import random
 import math
 
+_log = logging.getLogger(__name__)
+
 def start_pulse_reaction(geometry_np, params):
     if not geometry_np or geometry_np.isEmpty(): return None
     original_scale = geometry_np.getScale()
@@ -14,18 +17,19 @@ def start_pulse_reaction(geometry_np, params):
     strength = params.get('reaction_strength', 1.0)
 
     pulse_scale = original_scale * (1 + 0.5 * strength)
+    half_period = 0.5 / max(0.01, speed)
 
     pulse_seq = Sequence(
         LerpScaleInterval(
             geometry_np,
-            duration=0.5 / max(0.01, speed),
+            duration=half_period,
             scale=pulse_scale,
             startScale=original_scale,
             blendType='easeInOut'
         ),
         LerpScaleInterval(
             geometry_np,
-            duration=0.5 / max(0.01, speed),
+            duration=half_period,
             scale=original_scale,
             startScale=pulse_scale,
             blendType='easeInOut'
@@ -59,17 +63,16 @@ def start_rotate_reaction(geometry_np, params):
     base_duration_per_360 = 2.0
     duration = (max_angle / 360.0) * (base_duration_per_360 / max(0.01, speed))
 
-    rotate_seq = Sequence(
-        LerpHprInterval(
-            geometry_np,
-            duration=duration,
-            hpr=hpr_end,
-            startHpr=hpr_start
-        ),
+    # A single lerp loops on its own; wrapping it in a Sequence only adds a meta-interval.
+    rotate_ival = LerpHprInterval(
+        geometry_np,
+        duration=duration,
+        hpr=hpr_end,
+        startHpr=hpr_start,
         name=f"rotate_reaction_{geometry_np.getName()}"
     )
-    rotate_seq.loop()
-    return rotate_seq
+    rotate_ival.loop()
+    return rotate_ival
 
 def start_color_reaction(geometry_np, params):
     if not geometry_np or geometry_np.isEmpty(): return None
@@ -155,7 +158,7 @@ def start_bounce_reaction(root_np, params):
 def stop_reaction(element_data):
     interval = element_data.get('interval')
     if element_data.get('active') and interval:
-        print(f"Stopping reaction: {interval.getName()}")
+        _log.debug("Stopping reaction: %s", interval.getName())
         interval.finish()
         element_data['interval'] = None
         element_data['active'] = False
@@ -1,12 +1,16 @@
+import logging
 import random
 import math
 from panda3d.core import (
-    NodePath, Point3, Vec4, Vec3, CollisionNode, CollisionSphere, BitMask32
+    NodePath, Point3, Vec4, Vec3, CollisionNode, CollisionSphere
 )
 from . import reactions
 from ..utils import geometry_utils
+from ..utils.settings import DEFAULT_PLAYER_MASK, ALL_OFF_MASK
 import copy
 
+_log = logging.getLogger(__name__)
+
 class ReactiveManager:
 
     def __init__(self, app, root_node):
@@ -20,7 +24,8 @@ class ReactiveManager:
         self.collision_consts = self.app.settings_manager.constants.get('collision', {})
         self.proc_geom_consts = self.app.settings_manager.constants.get('procedural_geometry', {})
         self.env_consts = self.app.settings_manager.constants.get('environment', {})
-
+        # Looked up on every trigger event
+        self._tag_reactive = self.collision_consts.get('TAG_REACTIVE', 'ReactiveElement')
 
     def create_reactive_element(self, element_type, position, **kwargs):
         element_id = len(self.reactive_elements)
@@ -53,7 +58,7 @@ class ReactiveManager:
         )
         if not geometry:
             element_root.removeNode()
-            print(f"Failed to create geometry for reactive element {element_id} (shape: {shape_key})")
+            _log.error("Failed to create geometry for reactive element %s (shape: %s)", element_id, shape_key)
             return None
 
         geometry.reparentTo(element_root)
@@ -63,7 +68,7 @@ class ReactiveManager:
             geom_color = Vec4(0.6, 0.6, 0.9, 1)
         geometry.setScale(geom_scale)
         geometry.setColor(geom_color)
-        geometry.setCollideMask(BitMask32(0))
+        geometry.setCollideMask(ALL_OFF_MASK)
 
         trigger_prefix = self.react_consts.get('COLLISION_NODE_PREFIX', 'trigger_')
         trigger_node_name = f"{trigger_prefix}{element_type}_{element_id}"
@@ -73,44 +78,52 @@ class ReactiveManager:
         trigger_sphere = CollisionSphere(0, 0, 0, trigger_radius)
         trigger_node.addSolid(trigger_sphere)
 
-        mask_player = self.collision_consts.get('MASK_PLAYER', BitMask32(2))
+        mask_player = self.collision_consts.get('MASK_PLAYER', DEFAULT_PLAYER_MASK)
         trigger_node.setIntoCollideMask(mask_player)
-        trigger_node.setFromCollideMask(BitMask32(0))
+        trigger_node.setFromCollideMask(ALL_OFF_MASK)
         trigger_np = element_root.attachNewNode(trigger_node)
 
         tag_root = self.react_consts.get('PYTHON_TAG_ROOT', 'element_root')
         tag_geom = self.react_consts.get('PYTHON_TAG_GEOM', 'geometry')
         tag_type = self.react_consts.get('PYTHON_TAG_TYPE', 'reaction_type')
         tag_params = self.react_consts.get('PYTHON_TAG_PARAMS', 'params')
-        tag_reactive_flag = self.collision_consts.get('TAG_REACTIVE', 'ReactiveElement')
 
         trigger_np.setPythonTag(tag_root, element_root)
         trigger_np.setPythonTag(tag_geom, geometry)
         trigger_np.setPythonTag(tag_type, element_type)
         trigger_np.setPythonTag(tag_params, params.copy())
-        trigger_np.setPythonTag(tag_reactive_flag, True)
+        trigger_np.setPythonTag(self._tag_reactive, True)
 
         element_data = {
             'id': element_id, 'root': element_root, 'geometry': geometry,
             'trigger': trigger_np, 'type': element_type,
             'params': params.copy(),
-            'active': False, 'interval': None
+            'active': False, 'interval': None,
+            'xy': (position.x, position.y), 'visible': True
         }
         self.reactive_elements.append(element_data)
 
-        if hasattr(self.app, 'event_handler') and self.app.event_handler:
-             self.app.add_collider_to_main_traverser(trigger_np, self.app.event_handler)
-        else:
-             print(f"ERROR: Cannot add trigger {trigger_np.getName()} - app.event_handler not found!")
-
+        # Triggers are into-only (empty from mask): the player's capsule is the collider that
+        # raises the enter/exit events, so they are not registered with the traverser.
         return element_data
 
 
     def populate_reactive_elements(self, static_env_manager, num_elements=30):
-        print(f"Populating {num_elements} reactive elements...")
+        """Creates all reactive elements synchronously."""
+        for _ in self.iter_populate_reactive_elements(static_env_manager, num_elements):
+            pass
+
+    def iter_populate_reactive_elements(self, static_env_manager, num_elements=30, batch_size=1):
+        """
+        Generator form of populate_reactive_elements: yields a list of the element_data
+        created after every `batch_size` placement attempts, so callers can spread the
+        work over several frames.
+        """
+        _log.debug("Populating %d reactive elements...", num_elements)
         element_types={'pulse':5,'rotate':4,'color':4,'float':3,'bounce':2}
         weighted_types=[t for t,w in element_types.items() for _ in range(w)]
         created_count=0; attempts=0; max_attempts=num_elements*5
+        batch=[]
 
         terrain_size = self.env_consts.get('TERRAIN_SIZE', 200.0)
         half_terrain = terrain_size * 0.5
@@ -126,7 +139,7 @@ class ReactiveManager:
             if hasattr(static_env_manager, 'get_terrain_height'):
                  ground_height = static_env_manager.get_terrain_height(nx,ny)
             else:
-                 print("Warning: static_env_manager missing get_terrain_height method.")
+                 _log.warning("static_env_manager missing get_terrain_height method.")
                  ground_height = 0
 
             z=ground_height+random.uniform(1.5,10); position=Point3(x,y,z)
@@ -134,9 +147,16 @@ class ReactiveManager:
             too_close=any((elem['root'].getPos()-position).lengthSquared()<min_dist_sq for elem in self.reactive_elements)
             if not too_close:
                 params_override=self._get_element_params_override(element_type)
-                if self.create_reactive_element(element_type,position,**params_override):
+                element_data=self.create_reactive_element(element_type,position,**params_override)
+                if element_data:
                     created_count+=1
-        print(f"Reactive elements populated: {created_count}/{num_elements}")
+                    batch.append(element_data)
+            if attempts % max(1, batch_size) == 0:
+                yield batch
+                batch=[]
+        if batch:
+            yield batch
+        _log.debug("Reactive elements populated: %d/%d", created_count, num_elements)
 
     def _get_element_params_override(self, element_type):
         params = {}; shape_choices = ['sphere', 'cube', 'cylinder']
@@ -159,18 +179,31 @@ class ReactiveManager:
         if 'target_color' in params and isinstance(params['target_color'], list): params['target_color'] = Vec4(*params['target_color'])
         return params
 
+    def update_element_visibility(self, player_pos, max_dist):
+        """Hide elements farther than max_dist (in XY) from player_pos and show the rest."""
+        max_dist_sq = max_dist * max_dist
+        px, py = player_pos.x, player_pos.y
+        for element_data in self.reactive_elements:
+            ex, ey = element_data['xy']
+            dx = ex - px; dy = ey - py
+            visible = dx * dx + dy * dy <= max_dist_sq
+            if visible != element_data['visible']:
+                element_data['visible'] = visible
+                if visible: element_data['root'].show()
+                else: element_data['root'].hide()
+
     def _find_element_data_by_trigger(self, trigger_np):
         for element_data in self.reactive_elements:
             if element_data['trigger'] == trigger_np: return element_data
         return None
 
     def handle_collision_enter(self, entry):
-        tag_reactive_flag = self.collision_consts.get('TAG_REACTIVE', 'ReactiveElement')
-        trigger_np = entry.getIntoNodePath().findNetPythonTag(tag_reactive_flag)
+        if not self.app.sim_running: return
+        trigger_np = entry.getIntoNodePath().findNetPythonTag(self._tag_reactive)
         if not trigger_np.isEmpty():
             element_data = self._find_element_data_by_trigger(trigger_np)
             if element_data and not element_data['active']:
-                print(f"Player entered trigger: {trigger_np.getName()}")
+                _log.debug("Player entered trigger: %s", trigger_np.getName())
                 reaction_type = element_data['type']
                 reaction_func_name = f"start_{reaction_type}_reaction"
                 if hasattr(reactions, reaction_func_name):
@@ -179,28 +212,25 @@ class ReactiveManager:
                     interval = reaction_func(target_np, element_data['params'])
                     if interval:
                         element_data['interval'] = interval; element_data['active'] = True
-                    else: print(f"Warning: Reaction function {reaction_func_name} did not return an interval.")
-                else: print(f"Warning: No reaction function found for type '{reaction_type}' in reactions module.")
+                    else: _log.warning("Reaction function %s did not return an interval.", reaction_func_name)
+                else: _log.warning("No reaction function found for type '%s' in reactions module.", reaction_type)
 
     def handle_collision_exit(self, entry):
-        tag_reactive_flag = self.collision_consts.get('TAG_REACTIVE', 'ReactiveElement')
-        trigger_np = entry.getIntoNodePath().findNetPythonTag(tag_reactive_flag)
+        if not self.app.sim_running: return
+        trigger_np = entry.getIntoNodePath().findNetPythonTag(self._tag_reactive)
         if not trigger_np.isEmpty():
              element_data = self._find_element_data_by_trigger(trigger_np)
              if element_data and element_data['active']:
-                 print(f"Player exited trigger: {trigger_np.getName()}")
+                 _log.debug("Player exited trigger: %s", trigger_np.getName())
                  reactions.stop_reaction(element_data)
 
     def cleanup(self):
-        print("Cleaning up reactive manager...")
+        _log.debug("Cleaning up reactive manager...")
         for element_data in self.reactive_elements:
             if element_data.get('active') and element_data.get('interval'):
                 element_data['interval'].finish()
                 element_data['interval'] = None
                 element_data['active'] = False
-            if element_data.get('trigger') and not element_data['trigger'].isEmpty():
-                 if self.app:
-                     self.app.remove_collider_from_main_traverser(element_data['trigger'])
 
             if element_data.get('root') and not element_data['root'].isEmpty():
                 element_data['root'].removeNode()
@@ -209,4 +239,4 @@ class ReactiveManager:
         if self.root_node and not self.root_node.isEmpty():
             self.root_node.removeNode()
         self.root_node = None
-        print("Reactive manager cleanup complete.")
\ No newline at end of file
+        _log.debug("Reactive manager cleanup complete.")
\ No newline at end of file
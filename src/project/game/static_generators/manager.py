@@ -1,3 +1,4 @@
+import logging
 import random
 import math
 from panda3d.core import (
@@ -8,6 +9,8 @@ from direct.interval.IntervalManager import ivalMgr
 from .sky_generator import SkyGenerator
 from .terrain_generator import TerrainGenerator
 
+_log = logging.getLogger(__name__)
+
 class StaticEnvironmentManager:
     """
     Manages the creation and cleanup of the static (non-reactive)
@@ -47,13 +50,13 @@ class StaticEnvironmentManager:
         self.sky_generator.generate_sky()
         self.terrain_generator.generate_terrain_and_features()
 
-        print("StaticEnvironmentManager initialized.")
+        _log.debug("StaticEnvironmentManager initialized.")
 
     def _get_palette_color(self, key, default=Vec4(1,1,1,1)):
        return self.settings_manager.get_palette_color(key, default)
 
     def _setup_lighting(self):
-        print("Setting up global lighting...")
+        _log.debug("Setting up global lighting...")
         ambient_color = self._get_palette_color('ambient')
         dir_color = self._get_palette_color('directional')
         
@@ -79,10 +82,10 @@ class StaticEnvironmentManager:
         self.render.setLight(self.fill_light_np)
         self.static_elements.append(self.fill_light_np)
 
-        print("Global lighting setup complete.")
+        _log.debug("Global lighting setup complete.")
 
     def _add_fog_effect(self):
-        print("Adding global fog...")
+        _log.debug("Adding global fog...")
         fog_color = self.env_consts.get('FOG_COLOR', self._get_palette_color('fog'))
         fog_density = self.env_consts.get('FOG_DENSITY', 0.004)
 
@@ -90,7 +93,7 @@ class StaticEnvironmentManager:
         self.fog.setColor(fog_color)
         self.fog.setExpDensity(fog_density)
         self.render.setFog(self.fog)
-        print("Global fog added.")
+        _log.debug("Global fog added.")
 
     def get_terrain_height(self, nx, ny):
         if self.terrain_generator:
@@ -102,7 +105,7 @@ class StaticEnvironmentManager:
         return 0
 
     def cleanup(self):
-        print("Cleaning up StaticEnvironmentManager...")
+        _log.debug("Cleaning up StaticEnvironmentManager...")
 
         if hasattr(self, 'terrain_generator') and self.terrain_generator:
             self.terrain_generator.cleanup()
@@ -111,7 +114,7 @@ class StaticEnvironmentManager:
             self.sky_generator.cleanup()
             self.sky_generator = None
 
-        print(f"Removing {len(self.static_elements)} manager-tracked static elements (lights)...")
+        _log.debug("Removing %d manager-tracked static elements (lights)...", len(self.static_elements))
         for element_np in reversed(self.static_elements):
             if element_np and not element_np.isEmpty():
                 light = element_np.node()
@@ -122,9 +125,9 @@ class StaticEnvironmentManager:
         self.static_elements.clear()
 
         self.render.clearFog()
-        print("Cleared fog and global lights.")
+        _log.debug("Cleared fog and global lights.")
 
         if self.root_node and not self.root_node.isEmpty() and self.root_node != self.render:
             self.root_node.removeNode()
         self.root_node = None
-        print("StaticEnvironmentManager cleanup complete.")
\ No newline at end of file
+        _log.debug("StaticEnvironmentManager cleanup complete.")
\ No newline at end of file
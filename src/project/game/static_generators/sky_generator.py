@@ -1,3 +1,4 @@
+import logging
 import random
 import math
 from panda3d.core import (
@@ -10,6 +11,8 @@ from direct.interval.IntervalGlobal import Sequence # Sequence might be used by
 # Assuming geometry_utils is in project.utils
 from ...utils import geometry_utils # Make sure this import path is correct
 
+_log = logging.getLogger(__name__)
+
 def _rand_uniform(range_list):
     """Helper function to get a random uniform number within a specified range."""
     if not isinstance(range_list, list) or len(range_list) != 2:
@@ -37,7 +40,7 @@ class SkyGenerator:
 
     def generate_sky(self):
         """Generates a beautiful sky dome with a smoother gradient."""
-        print("Generating sky dome (stars removed)...")
+        _log.debug("Generating sky dome (stars removed)...")
         
         # Sky dome setup
         sky_dome_scale = self.env_consts.get('SKY_DOME_SCALE', 500.0)
@@ -70,7 +73,7 @@ class SkyGenerator:
             )
             
             if not sky_sphere:
-                print("Failed to create sky sphere, skipping sky generation.")
+                _log.error("Failed to create sky sphere, skipping sky generation.")
                 return
             
             # Set up the sky sphere
@@ -105,19 +108,16 @@ class SkyGenerator:
             
             # Star generation and add_enhanced_stars method call REMOVED
             
-            print("Sky dome generation complete (stars removed).")
+            _log.debug("Sky dome generation complete (stars removed).")
             
-        except Exception as e:
-            import traceback
-            print(f"Error creating sky: {e}")
-            traceback.print_exc()
-            print("Continuing without sky or with partial sky elements...")
+        except Exception:
+            _log.exception("Error creating sky; continuing without sky or with partial sky elements.")
 
     # add_enhanced_stars method REMOVED
 
     def cleanup(self):
         """Cleans up all generated sky elements and stops animations."""
-        print("Cleaning up SkyGenerator...")
+        _log.debug("Cleaning up SkyGenerator...")
         for interval in self.animating_intervals: # Still here if other animations are added
             if interval:
                 interval.finish() 
@@ -127,4 +127,4 @@ class SkyGenerator:
             if element_np and not element_np.isEmpty():
                 element_np.removeNode()
         self.static_elements.clear()
-        print("SkyGenerator cleanup complete.")
+        _log.debug("SkyGenerator cleanup complete.")
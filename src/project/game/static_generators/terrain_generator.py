@@ -1,13 +1,30 @@
+import logging
 import math
 import random
+from collections import OrderedDict
 import numpy as np
 from panda3d.core import (
-    NodePath, Point3, Vec4, Vec3, BitMask32, TransparencyAttrib,
-    Texture, TextureStage, PNMImage, CardMaker, GeomVertexWriter,
-    GeomVertexData, Geom, GeomNode, GeomTriangles, GeomVertexFormat, GeomVertexRewriter
+    NodePath, Point3, Vec4, TransparencyAttrib,
+    Texture, TextureStage, PNMImage, CardMaker,
+    GeomVertexData, Geom, GeomNode, GeomTriangles, GeomVertexFormat, GeomVertexRewriter,
+    GeomVertexArrayFormat, InternalName, CollisionNode, CollisionPolygon
 )
 from direct.interval.IntervalGlobal import Sequence, LerpPosInterval, LerpColorScaleInterval, Wait
 from ...utils import geometry_utils
+from ...utils.settings import DEFAULT_GROUND_MASK, ALL_OFF_MASK
+
+_log = logging.getLogger(__name__)
+
+def _make_chunk_vertex_format():
+    """Packed float32 position/normal/color rows, matching TerrainGenerator.build_chunk_data"""
+    array_format = GeomVertexArrayFormat()
+    array_format.addColumn(InternalName.getVertex(), 3, Geom.NTFloat32, Geom.CPoint)
+    array_format.addColumn(InternalName.getNormal(), 3, Geom.NTFloat32, Geom.CNormal)
+    array_format.addColumn(InternalName.getColor(), 4, Geom.NTFloat32, Geom.CColor)
+    return GeomVertexFormat.registerFormat(GeomVertexFormat(array_format))
+
+_CHUNK_VERTEX_FORMAT = _make_chunk_vertex_format()
+_CHUNK_VERTEX_COLUMNS = 10  # floats per row in _CHUNK_VERTEX_FORMAT
 
 # Noise implementation for Panda3D (Keep as is)
 class NoiseGenerator:
@@ -30,6 +47,11 @@ class NoiseGenerator:
             (1, 0), (-1, 0), (0, 1), (0, -1)
         ]
         
+        # Array copies of the tables for the vectorized *_array variants
+        self._perm_array = np.array(self.perm, dtype=np.int64)
+        self._grad_x = np.array([g[0] for g in self.grad2], dtype=np.float64)
+        self._grad_y = np.array([g[1] for g in self.grad2], dtype=np.float64)
+        
     def noise2d(self, x, y):
         """Generate 2D simplex-like noise value in range [-1, 1]"""
         # Integer coordinates
@@ -79,6 +101,47 @@ class NoiseGenerator:
         # Normalize to range [-1, 1] (avoid division by zero)
         return total / max(max_value, 1e-6)
     
+    def noise2d_array(self, x, y):
+        """Vectorized noise2d over NumPy arrays of coordinates (same values as the scalar version)"""
+        x_floor = np.floor(x)
+        y_floor = np.floor(y)
+        fx, fy = x - x_floor, y - y_floor
+        ix = x_floor.astype(np.int64) & 255
+        iy = y_floor.astype(np.int64) & 255
+        
+        n00 = self._gradient_array(ix, iy, fx, fy)
+        n01 = self._gradient_array(ix, iy + 1, fx, fy - 1)
+        n10 = self._gradient_array(ix + 1, iy, fx - 1, fy)
+        n11 = self._gradient_array(ix + 1, iy + 1, fx - 1, fy - 1)
+        
+        fx = self._fade(fx)
+        fy = self._fade(fy)
+        
+        nx0 = self._lerp(n00, n10, fx)
+        nx1 = self._lerp(n01, n11, fx)
+        return self._lerp(nx0, nx1, fy) * 0.707
+    
+    def fbm_array(self, x, y, octaves=6, persistence=0.5, lacunarity=2.0):
+        """Vectorized fbm over NumPy arrays of coordinates"""
+        total = np.zeros_like(x)
+        frequency = 1
+        amplitude = 1
+        max_value = 0
+        
+        for _ in range(octaves):
+            total += self.noise2d_array(x * frequency, y * frequency) * amplitude
+            max_value += amplitude
+            amplitude *= persistence
+            frequency *= lacunarity
+            
+        return total / max(max_value, 1e-6)
+    
+    def _gradient_array(self, ix, iy, fx, fy):
+        """Vectorized _gradient"""
+        perm = self._perm_array
+        g_idx = perm[(ix + perm[iy & 255]) & 255] % 8
+        return self._grad_x[g_idx] * fx + self._grad_y[g_idx] * fy
+    
     def _gradient(self, ix, iy, fx, fy):
         """Calculate gradient noise contribution"""
         # Get gradient vector
@@ -99,6 +162,9 @@ class NoiseGenerator:
 class TerrainGenerator:
     """Generates an infinite-looking terrain using chunked noise generation."""
     
+    HEIGHT_CACHE_SIZE = 65536  # most recently used (x, y) heights kept by calculate_terrain_height
+    COLLISION_TILE_CELLS = 4  # quads per side of each ground CollisionNode within a chunk
+    
     def __init__(self, app, root_node, settings_manager, palette, proc_gen_consts, collision_consts, **kwargs):
         self.app = app
         self.render = app.render
@@ -136,10 +202,33 @@ class TerrainGenerator:
         self.chunk_size = self.terrain_settings.get('chunk_size', 16)
         self.view_distance = self.terrain_settings.get('view_distance', 3)  # Modified in constructor
         self.height_scale = self.terrain_settings.get('height_scale', 15.0)
+        self._mesh_size = self.terrain_settings.get('detail_mesh_size', 2.0)
+        # Noise inputs of the height function, read on every height cache miss
+        self._noise_scale = self.terrain_settings.get('noise_scale', 0.01)
+        self._octaves = self.terrain_settings.get('octaves', 4)  # OPTIMIZED: Using fewer octaves
+        self._persistence = self.terrain_settings.get('persistence', 0.5)
+        self._lacunarity = self.terrain_settings.get('lacunarity', 2.0)
+        self._mesh_segments = int(self.chunk_size / self._mesh_size)
         self.current_center_chunk = None
+        self.visible_chunks = set()
+        # Ground CollisionNodes are only tested by a player ground ray; the player normally
+        # answers ground checks from ground_height_at instead (see set_ground_collision)
+        self.ground_collision = False
+        
+        # Chunk offsets inside the circular view distance, nearest first
+        view_sq = self.view_distance ** 2
+        self._visible_offsets = sorted(
+            (dx * dx + dy * dy, dx, dy)
+            for dx in range(-self.view_distance, self.view_distance + 1)
+            for dy in range(-self.view_distance, self.view_distance + 1)
+            if dx * dx + dy * dy <= view_sq
+        )
+        
+        # OPTIMIZATION 4: LRU height cache, bounded so roaming doesn't grow it forever
+        self.height_cache = OrderedDict()
         
-        # OPTIMIZATION 4: Larger height cache for better memory usage vs CPU tradeoff
-        self.height_cache = {}
+        # Color bands are looked up for every mesh quad, so resolve them once
+        self._init_color_bands()
         
     def _get_terrain_settings(self):
         """Get terrain settings from configuration"""
@@ -186,29 +275,55 @@ class TerrainGenerator:
         """Get a color from the palette"""
         return self.settings_manager.get_palette_color(key, default)
     
+    def _init_color_bands(self):
+        """Cache the palette colors and reference heights used by terrain_colors_array"""
+        # Reference heights for color transitions
+        water_level = self.terrain_settings.get('water_level', -2.0)
+        beach_level = water_level + 1.0
+        grass_level = beach_level + 2.0
+        mountain_level = grass_level + 8.0
+        snow_level = mountain_level + 4.0
+        color_levels = (water_level, beach_level, grass_level, mountain_level, snow_level)
+        
+        # Base colors from palette
+        band_colors = (
+            self._get_palette_color('water', Vec4(0.1, 0.3, 0.6, 1.0)),
+            self._get_palette_color('beach', Vec4(0.8, 0.7, 0.5, 1.0)),
+            self._get_palette_color('grass', Vec4(0.3, 0.5, 0.2, 1.0)),
+            self._get_palette_color('rock', Vec4(0.5, 0.4, 0.3, 1.0)),
+            self._get_palette_color('snow', Vec4(0.9, 0.9, 0.95, 1.0)),
+        )
+        
+        # Per-band (start color, end color, lower level, upper level) tables for
+        # terrain_colors_array, indexed by how many levels a height has passed
+        water, beach, grass, rock, snow = [list(c) for c in band_colors]
+        self._band_levels_array = np.array(color_levels)
+        self._band_start_colors = np.array([water, water, beach, grass, rock, snow])
+        self._band_end_colors = np.array([water, beach, grass, rock, snow, snow])
+        self._band_lower = np.array([water_level, water_level, beach_level, grass_level, mountain_level, snow_level])
+        self._band_upper = np.array([water_level, beach_level, grass_level, mountain_level, snow_level, snow_level])
+    
     def _set_geometry_collision(self, node_path):
         """Set collision properties for terrain geometry"""
-        mask_ground = self.collision_consts.get('MASK_GROUND', BitMask32(1))
+        mask_ground = self.collision_consts.get('MASK_GROUND', DEFAULT_GROUND_MASK)
         node_path.setCollideMask(mask_ground)
     
     def calculate_terrain_height(self, world_x, world_y):
         """Calculate terrain height at a specific world coordinate (X, Y)"""
         # Check if height is already cached
         cache_key = (world_x, world_y)
-        if cache_key in self.height_cache:
-            return self.height_cache[cache_key]
+        height_cache = self.height_cache
+        cached = height_cache.get(cache_key)
+        if cached is not None:
+            height_cache.move_to_end(cache_key)
+            return cached
         
         # Scale coordinates to noise space
-        noise_scale = self.terrain_settings.get('noise_scale', 0.01)
+        noise_scale = self._noise_scale
         nx, ny = world_x * noise_scale, world_y * noise_scale
         
-        # Get noise settings
-        octaves = self.terrain_settings.get('octaves', 4)  # OPTIMIZED: Using fewer octaves
-        persistence = self.terrain_settings.get('persistence', 0.5)
-        lacunarity = self.terrain_settings.get('lacunarity', 2.0)
-        
         # Calculate base height using FBM noise
-        height = self.noise_gen.fbm(nx, ny, octaves, persistence, lacunarity)
+        height = self.noise_gen.fbm(nx, ny, self._octaves, self._persistence, self._lacunarity)
         
         # Add some large-scale variation
         large_scale = self.noise_gen.noise2d(nx * 0.2, ny * 0.2) * 0.3
@@ -220,70 +335,76 @@ class TerrainGenerator:
         combined_height = height + large_scale + medium_scale
         
         # Scale to desired height range
-        height_scale = self.terrain_settings.get('height_scale', 15.0)
-        final_height = combined_height * height_scale
+        final_height = combined_height * self.height_scale
 
-        # Cache the result
-        self.height_cache[cache_key] = final_height
+        # Cache the result, evicting the least recently used entry when full
+        height_cache[cache_key] = final_height
+        if len(height_cache) > self.HEIGHT_CACHE_SIZE:
+            height_cache.popitem(last=False)
         return final_height
     
-    def get_terrain_color(self, world_x, world_y, height):
-        """Determine terrain color based on height and additional factors"""
-        # Get slope by sampling nearby heights
-        sample_dist = 2.0
-        h_px = self.calculate_terrain_height(world_x + sample_dist, world_y)
-        h_nx = self.calculate_terrain_height(world_x - sample_dist, world_y)
-        h_py = self.calculate_terrain_height(world_x, world_y + sample_dist)
-        h_ny = self.calculate_terrain_height(world_x, world_y - sample_dist)
+    def ground_height_at(self, world_x, world_y):
+        """
+        Z of the terrain mesh surface at (world_x, world_y), interpolated over the same
+        triangle build_chunk_data emits there, or None if no loaded chunk covers the point
+        """
+        chunk_size = self.chunk_size
+        chunk_x = math.floor(world_x / chunk_size)
+        chunk_y = math.floor(world_y / chunk_size)
+        if (chunk_x, chunk_y) not in self.loaded_chunks:
+            return None
+        
+        mesh_size = self._mesh_size
+        u = (world_x - chunk_x * chunk_size) / mesh_size
+        v = (world_y - chunk_y * chunk_size) / mesh_size
+        i = min(int(u), self._mesh_segments - 1)
+        j = min(int(v), self._mesh_segments - 1)
+        u -= i
+        v -= j
+        x0 = chunk_x * chunk_size + i * mesh_size
+        y0 = chunk_y * chunk_size + j * mesh_size
+        h_bl = self.calculate_terrain_height(x0, y0)
+        h_tr = self.calculate_terrain_height(x0 + mesh_size, y0 + mesh_size)
+        # Quads are split along BL->TR into (BL, BR, TR) and (BL, TR, TL)
+        if u >= v:
+            h_br = self.calculate_terrain_height(x0 + mesh_size, y0)
+            return h_bl + u * (h_br - h_bl) + v * (h_tr - h_br)
+        h_tl = self.calculate_terrain_height(x0, y0 + mesh_size)
+        return h_bl + v * (h_tl - h_bl) + u * (h_tr - h_tl)
+    
+    def calculate_height_grid(self, xs, ys):
+        """
+        Heights for every (xs[i], ys[j]) pair as an array indexed [i][j], computed in
+        one vectorized pass with the same formula as calculate_terrain_height
+        """
+        grid_x, grid_y = np.meshgrid(np.asarray(xs, dtype=np.float64),
+                                     np.asarray(ys, dtype=np.float64), indexing='ij')
         
-        slope_x = (h_px - h_nx) / (2 * sample_dist)
-        slope_y = (h_py - h_ny) / (2 * sample_dist)
-        slope = math.sqrt(slope_x**2 + slope_y**2)
+        noise_scale = self._noise_scale
+        nx, ny = grid_x * noise_scale, grid_y * noise_scale
         
-        # Reference heights for color transitions
-        water_level = self.terrain_settings.get('water_level', -2.0)
-        beach_level = water_level + 1.0
-        grass_level = beach_level + 2.0
-        mountain_level = grass_level + 8.0
-        snow_level = mountain_level + 4.0
+        height = self.noise_gen.fbm_array(nx, ny, self._octaves, self._persistence, self._lacunarity)
+        large_scale = self.noise_gen.noise2d_array(nx * 0.2, ny * 0.2) * 0.3
+        medium_scale = self.noise_gen.noise2d_array(nx * 2.0, ny * 2.0) * 0.15
         
-        # Get base colors from palette
-        water_color = self._get_palette_color('water', Vec4(0.1, 0.3, 0.6, 1.0))
-        beach_color = self._get_palette_color('beach', Vec4(0.8, 0.7, 0.5, 1.0))
-        grass_color = self._get_palette_color('grass', Vec4(0.3, 0.5, 0.2, 1.0))
-        rock_color = self._get_palette_color('rock', Vec4(0.5, 0.4, 0.3, 1.0))
-        snow_color = self._get_palette_color('snow', Vec4(0.9, 0.9, 0.95, 1.0))
-        
-        # Determine base color by height
-        color = grass_color # Default
-        if height < water_level:
-            # Still using water color, but we never skip the geometry
-            color = water_color
-        elif height < beach_level:
-            t = (height - water_level) / max(1e-6, beach_level - water_level)
-            color = water_color * (1 - t) + beach_color * t
-        elif height < grass_level:
-            t = (height - beach_level) / max(1e-6, grass_level - beach_level)
-            color = beach_color * (1 - t) + grass_color * t
-        elif height < mountain_level:
-            # Blend between grass and rock based on height and slope
-            t_height = (height - grass_level) / max(1e-6, mountain_level - grass_level)
-            t_slope = min(1.0, max(0.0, (slope - 0.3) / 0.5))
-            t = max(t_height, t_slope)
-            color = grass_color * (1 - t) + rock_color * t
-        elif height < snow_level:
-            t = (height - mountain_level) / max(1e-6, snow_level - mountain_level)
-            color = rock_color * (1 - t) + snow_color * t
-        else:
-            color = snow_color
-        
-        # Skip biome variation to save calculations
-        return Vec4(
-            max(0, min(1, color[0])),
-            max(0, min(1, color[1])),
-            max(0, min(1, color[2])),
-            1.0
-        )
+        return (height + large_scale + medium_scale) * self.height_scale
+    
+    def terrain_colors_array(self, heights, slopes):
+        """Terrain colors for arrays of heights and slopes by height band; returns (..., 4) RGBA"""
+        band = np.searchsorted(self._band_levels_array, heights, side='right')
+        lower = self._band_lower[band]
+        t = (heights - lower) / np.maximum(1e-6, self._band_upper[band] - lower)
+        # Grass blends to rock by height or slope, whichever is further along
+        t_slope = np.clip((slopes - 0.3) / 0.5, 0.0, 1.0)
+        t = np.where(band == 3, np.maximum(t, t_slope), t)
+        # Below water and above snow are solid colors
+        t = np.where((band == 0) | (band == 5), 0.0, t)
+        
+        t = t[..., None]
+        colors = self._band_start_colors[band] * (1 - t) + self._band_end_colors[band] * t
+        colors = np.clip(colors, 0.0, 1.0)
+        colors[..., 3] = 1.0
+        return colors
     
     def create_terrain_chunk(self, chunk_x, chunk_y):
         """Create a single terrain chunk at the specified chunk coordinates (X, Y)"""
@@ -291,46 +412,85 @@ class TerrainGenerator:
         if chunk_key in self.loaded_chunks:
             # Chunk already loaded
             return self.loaded_chunks[chunk_key]
-        
-        # Create a node for this chunk
-        chunk_root = self.root_node.attachNewNode(f"terrain_chunk_{chunk_x}_{chunk_y}")
-        
+        return self.attach_chunk(chunk_key, self.build_chunk_data(chunk_x, chunk_y))
+    
+    def build_chunk_data(self, chunk_x, chunk_y):
+        """
+        CPU-heavy half of chunk creation, safe to run on a worker thread: it only uses
+        NumPy and read-only generator state. Returns (vertices, indices) where vertices
+        is a float32 (rows, 10) array in _CHUNK_VERTEX_FORMAT layout, four rows per quad
+        (BL, BR, TR, TL), and indices a uint16 triangle list
+        """
         # Convert chunk coordinates to world coordinates
         world_x_base = chunk_x * self.chunk_size
         world_y_base = chunk_y * self.chunk_size
         
-        # Get mesh detail size
-        mesh_size = self.terrain_settings.get('detail_mesh_size', 2.0)
+        # The same grid ground_height_at interpolates over
+        mesh_size = self._mesh_size
+        mesh_segments = self._mesh_segments
+        
+        # Every corner height of the chunk in one vectorized pass, indexed [i][j]
+        corner_offsets = np.arange(mesh_segments + 1) * mesh_size
+        xs = world_x_base + corner_offsets
+        ys = world_y_base + corner_offsets
+        heights = self.calculate_height_grid(xs, ys)
+        h_bl = heights[:-1, :-1]
+        h_br = heights[1:, :-1]
+        h_tr = heights[1:, 1:]
+        h_tl = heights[:-1, 1:]
+        
+        x0, y0 = np.meshgrid(xs[:-1], ys[:-1], indexing='ij')
+        x1 = x0 + mesh_size
+        y1 = y0 + mesh_size
+        
+        # Flat normal per quad: cross product of the BL->BR and BL->TL edges
+        normals = np.stack([
+            -mesh_size * (h_br - h_bl),
+            -mesh_size * (h_tl - h_bl),
+            np.full_like(h_bl, mesh_size * mesh_size)
+        ], axis=-1)
+        normals /= np.sqrt((normals * normals).sum(axis=-1, keepdims=True))
+        
+        # Color from the average height and the slope around each quad's center
+        sample_dist = 2.0
+        centers_x = xs[:-1] + mesh_size / 2
+        centers_y = ys[:-1] + mesh_size / 2
+        h_px = self.calculate_height_grid(centers_x + sample_dist, centers_y)
+        h_nx = self.calculate_height_grid(centers_x - sample_dist, centers_y)
+        h_py = self.calculate_height_grid(centers_x, centers_y + sample_dist)
+        h_ny = self.calculate_height_grid(centers_x, centers_y - sample_dist)
+        slopes = np.hypot((h_px - h_nx) / (2 * sample_dist), (h_py - h_ny) / (2 * sample_dist))
+        colors = self.terrain_colors_array((h_bl + h_br + h_tr + h_tl) / 4.0, slopes)
+        
+        # Quads don't share vertices so each keeps its own flat normal and color
+        vertices = np.empty((mesh_segments, mesh_segments, 4, _CHUNK_VERTEX_COLUMNS), dtype=np.float32)
+        vertices[:, :, 0, 0:3] = np.stack([x0, y0, h_bl], axis=-1)  # Bottom-Left
+        vertices[:, :, 1, 0:3] = np.stack([x1, y0, h_br], axis=-1)  # Bottom-Right
+        vertices[:, :, 2, 0:3] = np.stack([x1, y1, h_tr], axis=-1)  # Top-Right
+        vertices[:, :, 3, 0:3] = np.stack([x0, y1, h_tl], axis=-1)  # Top-Left
+        vertices[:, :, :, 3:6] = normals[:, :, None, :]
+        vertices[:, :, :, 6:10] = colors[:, :, None, :]
+        
+        # Two triangles make a quad: (BL, BR, TR) and (BL, TR, TL)
+        first = np.arange(mesh_segments * mesh_segments, dtype=np.uint16) * 4
+        indices = np.stack([first, first + 1, first + 2, first, first + 2, first + 3], axis=-1)
+        
+        return vertices.reshape(-1, _CHUNK_VERTEX_COLUMNS), indices.ravel()
+    
+    def attach_chunk(self, chunk_key, chunk_data):
+        """Main-thread half of chunk creation: wrap build_chunk_data output in nodes"""
+        if chunk_key in self.loaded_chunks:
+            return self.loaded_chunks[chunk_key]
+        chunk_x, chunk_y = chunk_key
         
-        # Calculate number of mesh segments in each direction
-        mesh_segments = int(self.chunk_size / mesh_size)
+        # Create a node for this chunk
+        chunk_root = self.root_node.attachNewNode(f"terrain_chunk_{chunk_x}_{chunk_y}")
         
-        # Generate terrain mesh grid
-        for i in range(mesh_segments):
-            for j in range(mesh_segments):
-                # Calculate world position for this mesh segment's corner
-                x_pos = world_x_base + i * mesh_size
-                y_pos = world_y_base + j * mesh_size
-
-                # Calculate heights for the 4 corners of this mesh segment
-                h_bl = self.calculate_terrain_height(x_pos, y_pos)
-                h_br = self.calculate_terrain_height(x_pos + mesh_size, y_pos)
-                h_tr = self.calculate_terrain_height(x_pos + mesh_size, y_pos + mesh_size)
-                h_tl = self.calculate_terrain_height(x_pos, y_pos + mesh_size)
-
-                # Store heights in the order expected by create_terrain_segment
-                heights = [h_bl, h_br, h_tr, h_tl]
-                
-                # Create a terrain mesh segment
-                segment = self.create_terrain_segment(
-                    x_pos, y_pos, mesh_size,
-                    heights,
-                    f"terrain_mesh_{i}_{j}"
-                )
-                
-                if segment:
-                    segment.reparentTo(chunk_root)
-                    self._set_geometry_collision(segment)
+        # The whole chunk is a single Geom so it costs one node and one draw call
+        vertices, indices = chunk_data
+        terrain_mesh = self.create_chunk_mesh(vertices, indices, f"terrain_mesh_{chunk_x}_{chunk_y}")
+        if terrain_mesh:
+            terrain_mesh.reparentTo(chunk_root)
         
         # Store the chunk
         self.loaded_chunks[chunk_key] = chunk_root
@@ -344,73 +504,79 @@ class TerrainGenerator:
         
         return chunk_root
     
-    def create_terrain_segment(self, x, y, size, heights, name):
-        """Create a single terrain mesh segment (XY plane) with the given corner heights"""
-        # Create a GeomVertexData object
-        format = GeomVertexFormat.getV3n3c4()
-        vdata = GeomVertexData(name, format, Geom.UHStatic)
-        
-        # Create writers for each column
-        vertex = GeomVertexWriter(vdata, 'vertex')
-        normal = GeomVertexWriter(vdata, 'normal')
-        color = GeomVertexWriter(vdata, 'color')
-        
-        # Get the corner heights
-        h_bl, h_br, h_tr, h_tl = heights
-        
-        # Define the 4 corners of the quad (relative to segment position)
-        half_size = size / 2
-        vertex.addData3f(-half_size, -half_size, h_bl)  # Bottom-Left
-        vertex.addData3f(half_size, -half_size, h_br)   # Bottom-Right
-        vertex.addData3f(half_size, half_size, h_tr)    # Top-Right
-        vertex.addData3f(-half_size, half_size, h_tl)   # Top-Left
-        
-        # Calculate a normal vector using the cross product of two edges
-        v1 = Vec3(size, 0, h_br - h_bl)  # Edge from BL to BR
-        v2 = Vec3(0, size, h_tl - h_bl)  # Edge from BL to TL
-        
-        # Cross product gives the normal
-        n = v1.cross(v2)
-        n.normalize()
-        
-        # Set the same normal for all vertices
-        for i in range(4):
-            normal.addData3f(n)
-        
-        # Calculate average height and position for coloring
-        avg_height = sum(heights) / 4.0
-        avg_x = x + size/2
-        avg_y = y + size/2
-        
-        # Get color based on the terrain's height and position
-        terrain_color = self.get_terrain_color(avg_x, avg_y, avg_height)
-        
-        # Apply the color to all vertices
-        for i in range(4):
-            color.addData4f(terrain_color)
-        
-        # Create the triangles (two triangles make a quad)
-        tris = GeomTriangles(Geom.UHStatic)
-        
-        # First triangle: Bottom-Left, Bottom-Right, Top-Right (0, 1, 2)
-        tris.addVertices(0, 1, 2)
+    def create_chunk_mesh(self, vertices, indices, name):
+        """
+        Create one GeomNode from build_chunk_data arrays; with ground_collision set it also
+        gets the child CollisionNodes from _create_ground_collision
+        """
+        # Bulk-copy the prepared rows and indices instead of writing them one by one
+        vdata = GeomVertexData(name, _CHUNK_VERTEX_FORMAT, Geom.UHStatic)
+        vdata.uncleanSetNumRows(len(vertices))
+        memoryview(vdata.modifyArray(0)).cast('B').cast('f')[:] = vertices.ravel()
         
-        # Second triangle: Bottom-Left, Top-Right, Top-Left (0, 2, 3)
-        tris.addVertices(0, 2, 3)
+        tris = GeomTriangles(Geom.UHStatic)
+        tris.setIndexType(Geom.NTUint16)
+        index_array = tris.modifyVertices()
+        index_array.uncleanSetNumRows(len(indices))
+        memoryview(index_array).cast('B').cast('H')[:] = indices
         
-        # Create the Geom object with triangles
         geom = Geom(vdata)
         geom.addPrimitive(tris)
         
-        # Create the GeomNode and add the Geom
         gnode = GeomNode(name)
         gnode.addGeom(geom)
-        
-        # Create a NodePath and set its position
-        segment_node = NodePath(gnode)
-        segment_node.setPos(x + size / 2, y + size / 2, 0)
-        
-        return segment_node
+        mesh_np = NodePath(gnode)
+        # Visible triangles are no longer collidable; only the CollisionNodes are
+        mesh_np.setCollideMask(ALL_OFF_MASK)
+        if self.ground_collision:
+            self._create_ground_collision(vertices, name).reparentTo(mesh_np)
+        return mesh_np
+    
+    def _create_ground_collision(self, vertices, name):
+        """
+        Ground CollisionNodes carrying the triangles of build_chunk_data vertices, one per
+        COLLISION_TILE_CELLS tile, under a single "<name>_coll" root
+        """
+        # Rays test these solids instead of the visible triangles. A CollisionNode's solids are
+        # all tested once its bounds are hit, so the chunk is split into tiles: the traverser
+        # culls whole tiles by bounding volume and only tests the polygons under the ray.
+        coll_root = NodePath(name + "_coll")
+        positions = vertices[:, 0:3].tolist()
+        segments = math.isqrt(len(positions) // 4)
+        tile = self.COLLISION_TILE_CELLS
+        for tile_i in range(0, segments, tile):
+            for tile_j in range(0, segments, tile):
+                coll_node = CollisionNode(f"{name}_coll_{tile_i}_{tile_j}")
+                for i in range(tile_i, min(tile_i + tile, segments)):
+                    for j in range(tile_j, min(tile_j + tile, segments)):
+                        row = (i * segments + j) * 4
+                        p_bl = Point3(*positions[row])
+                        p_tr = Point3(*positions[row + 2])
+                        coll_node.addSolid(CollisionPolygon(p_bl, Point3(*positions[row + 1]), p_tr))
+                        coll_node.addSolid(CollisionPolygon(p_bl, p_tr, Point3(*positions[row + 3])))
+                coll_root.attachNewNode(coll_node)
+        self._set_geometry_collision(coll_root)
+        return coll_root
+    
+    def set_ground_collision(self, enabled):
+        """
+        Add or strip the ground CollisionNodes of every loaded chunk; chunks attached later
+        follow the same setting. Only a ground ray needs them, so they're off by default.
+        """
+        if enabled == self.ground_collision:
+            return
+        self.ground_collision = enabled
+        for (chunk_x, chunk_y), chunk_root in self.loaded_chunks.items():
+            mesh_np = chunk_root.find(f"terrain_mesh_{chunk_x}_{chunk_y}")
+            if mesh_np.isEmpty():
+                continue
+            if enabled:
+                vertices, _ = self.build_chunk_data(chunk_x, chunk_y)
+                self._create_ground_collision(vertices, mesh_np.getName()).reparentTo(mesh_np)
+            else:
+                coll_root = mesh_np.find(mesh_np.getName() + "_coll")
+                if not coll_root.isEmpty():
+                    coll_root.removeNode()
     
     def generate_chunk_features(self, chunk_root, chunk_x, chunk_y):
         """Generate additional features like rocks, trees, etc. in a chunk"""
@@ -464,7 +630,15 @@ class TerrainGenerator:
     
     def update_visible_chunks(self, player_pos):
         """Update which chunks are visible based on player position"""
-        if player_pos is None: return
+        for chunk_key in self.plan_visible_chunks(player_pos):
+            self.create_terrain_chunk(*chunk_key)
+
+    def plan_visible_chunks(self, player_pos):
+        """
+        Unload chunks that fell out of view around player_pos and return the keys of
+        visible chunks that still need building, closest first
+        """
+        if player_pos is None: return []
 
         # Convert player position to chunk coordinates (Using X and Y)
         chunk_x = int(math.floor(player_pos.x / self.chunk_size))
@@ -472,49 +646,29 @@ class TerrainGenerator:
 
         # Skip if player hasn't moved to a new chunk
         if self.current_center_chunk == (chunk_x, chunk_y):
-            return
+            return []
             
         self.current_center_chunk = (chunk_x, chunk_y)
         
-        # Calculate chunks that should be visible
-        visible_chunks = set()
-        for x in range(chunk_x - self.view_distance, chunk_x + self.view_distance + 1):
-            for y in range(chunk_y - self.view_distance, chunk_y + self.view_distance + 1):
-                # Check if chunk is within view distance (circular)
-                dist_sq = (x - chunk_x)**2 + (y - chunk_y)**2
-                if dist_sq <= self.view_distance**2:
-                    visible_chunks.add((x, y))
-        
-        # Find chunks to unload (currently loaded but not visible)
-        chunks_to_unload = set(self.loaded_chunks.keys()) - visible_chunks
-        
-        # Unload chunks
-        for chunk_key in chunks_to_unload:
-            if chunk_key in self.loaded_chunks:
-                chunk_node = self.loaded_chunks.pop(chunk_key)
-                if chunk_node and not chunk_node.isEmpty():
-                    chunk_node.removeNode()
-        
-        # Load new visible chunks (OPTIMIZATION: Prioritize loading closest chunks first)
-        chunk_distances = []
-        for chunk_key in visible_chunks:
-            if chunk_key not in self.loaded_chunks:
-                x, y = chunk_key
-                dist_sq = (x - chunk_x)**2 + (y - chunk_y)**2
-                chunk_distances.append((dist_sq, chunk_key))
-        
-        # Sort by distance (closest first)
-        chunk_distances.sort()
-        for _, chunk_key in chunk_distances:
-            self.create_terrain_chunk(*chunk_key)
+        # Chunks that should be visible, nearest first
+        ordered_chunks = [(chunk_x + dx, chunk_y + dy) for _, dx, dy in self._visible_offsets]
+        self.visible_chunks = set(ordered_chunks)
+        
+        # Unload chunks that are loaded but no longer visible
+        for chunk_key in [key for key in self.loaded_chunks if key not in self.visible_chunks]:
+            chunk_node = self.loaded_chunks.pop(chunk_key)
+            if chunk_node and not chunk_node.isEmpty():
+                chunk_node.removeNode()
+        
+        return [key for key in ordered_chunks if key not in self.loaded_chunks]
 
     def generate_terrain_and_features(self):
         """Initial terrain generation centered at origin"""
-        print("Generating initial terrain chunks with noise-based height map...")
+        _log.debug("Generating initial terrain chunks with noise-based height map...")
         
         # Fallback: Generate initial grid manually if update doesn't run first
         if not self.current_center_chunk:
-            print("Generating fallback initial grid...")
+            _log.debug("Generating fallback initial grid...")
             # OPTIMIZATION: Generate only essential chunks at first
             for x in range(-self.view_distance, self.view_distance + 1):
                 for y in range(-self.view_distance, self.view_distance + 1):
@@ -523,11 +677,12 @@ class TerrainGenerator:
                     if dist_sq <= self.view_distance**2:
                         self.create_terrain_chunk(x, y)
             self.current_center_chunk = (0, 0)
+            self.visible_chunks = set(self.loaded_chunks)
 
-        print("Initial terrain generation complete.")
+        _log.debug("Initial terrain generation complete.")
 
     def cleanup(self):
-        print("Cleaning up TerrainGenerator...")
+        _log.debug("Cleaning up TerrainGenerator...")
         
         # Stop all animations
         for interval in self.animating_intervals:
@@ -553,4 +708,4 @@ class TerrainGenerator:
         # Clear height cache
         self.height_cache.clear()
         
-        print("TerrainGenerator cleanup complete.")
\ No newline at end of file
+        _log.debug("TerrainGenerator cleanup complete.")
\ No newline at end of file
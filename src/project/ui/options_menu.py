@@ -277,7 +277,7 @@ class OptionsMenuUI:
         new_sensitivity = round(max(self.min_sens, min(self.max_sens, self.min_sens + value * (self.max_sens - self.min_sens))), 1)
         print(f"Updating sensitivity to: {new_sensitivity}")
 
-        self.app.settings_manager.user_settings['sensitivity'] = new_sensitivity
+        self.app.settings_manager.set_user_setting('sensitivity', new_sensitivity)
 
         if hasattr(self, 'sens_value_label') and self.sens_value_label:
             self.sens_value_label['text'] = f"{new_sensitivity:.1f}"
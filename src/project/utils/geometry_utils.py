@@ -209,6 +209,9 @@ PROCEDURAL_SHAPES = {
     'plane': create_procedural_plane,
 }
 
+# (shape_key, args) -> NodePath holding the GeomNode that get_procedural_shape instances
+_shape_prototypes = {}
+
 def get_procedural_shape(shape_key, name="proc_shape", **kwargs):
     shape_func = PROCEDURAL_SHAPES.get(shape_key)
     if shape_func:
@@ -227,11 +230,18 @@ def get_procedural_shape(shape_key, name="proc_shape", **kwargs):
             if 'segments' in kwargs: relevant_args['segments'] = kwargs['segments']
 
         try:
-            # Create the geometry
-            geom_np = shape_func(name=name + "_geom", **relevant_args)
-            if not geom_np:
-                 print(f"Error: Shape function for '{shape_key}' returned None.")
-                 return None
+            # Build the geometry once per shape/arguments and instance it afterwards
+            cache_key = (shape_key, tuple(sorted(relevant_args.items())))
+            prototype = _shape_prototypes.get(cache_key)
+            if prototype is None:
+                prototype = shape_func(name=shape_key + "_proto", **relevant_args)
+                if not prototype:
+                     print(f"Error: Shape function for '{shape_key}' returned None.")
+                     return None
+                _shape_prototypes[cache_key] = prototype
+            # Callers transform and color this wrapper; the GeomNode below it is shared
+            geom_np = NodePath(name + "_geom")
+            prototype.instanceTo(geom_np)
             # Apply default material settings
             apply_default_material(geom_np)
             return geom_np
@@ -244,16 +254,30 @@ def get_procedural_shape(shape_key, name="proc_shape", **kwargs):
         print(f"Warning: Unknown procedural shape key '{shape_key}'.")
         return None
 
+# Shapes with identical lighting parameters share one Material object, so their
+# render states compare equal and Panda3D can sort and batch them together.
+_material_cache = {}
+
+def _get_shared_material(shininess, specular_color, ambient, diffuse):
+    key = (shininess, tuple(specular_color), tuple(ambient), tuple(diffuse))
+    material = _material_cache.get(key)
+    if material is None:
+        material = Material()
+        material.setShininess(shininess)
+        material.setSpecular(specular_color)
+        material.setAmbient(ambient)
+        material.setDiffuse(diffuse)
+        _material_cache[key] = material
+    return material
+
 def apply_default_material(nodepath, shininess=16, specular_color=Vec4(0.2, 0.2, 0.2, 1)): # Reduced shininess/specular
     """Apply a default material with proper lighting properties to a NodePath."""
     if not nodepath or nodepath.isEmpty():
         return
-    material = Material()
-    material.setShininess(shininess)
-    material.setSpecular(specular_color)
     # Make sure ambient/diffuse are not black by default
-    material.setAmbient(Vec4(0.6, 0.6, 0.6, 1)) # Allow ambient light influence
-    material.setDiffuse(Vec4(1, 1, 1, 1))    # Allow diffuse light influence
+    material = _get_shared_material(shininess, specular_color,
+                                    ambient=Vec4(0.6, 0.6, 0.6, 1), # Allow ambient light influence
+                                    diffuse=Vec4(1, 1, 1, 1))       # Allow diffuse light influence
     nodepath.setMaterial(material, 1) # Apply with override
 
     nodepath.setTwoSided(False) # Ensure single-sided rendering unless needed
@@ -269,10 +293,8 @@ def apply_crystal_material(nodepath, shininess=40, specular_color=Vec4(0.8, 0.8,
     """Apply a shiny material suitable for crystals."""
     if not nodepath or nodepath.isEmpty():
         return
-    material = Material()
-    material.setShininess(shininess)
-    material.setSpecular(specular_color)
     # Crystals might reflect ambient less, depending on desired look
-    material.setAmbient(Vec4(0.4, 0.4, 0.5, 1))
-    material.setDiffuse(Vec4(1, 1, 1, 1))
+    material = _get_shared_material(shininess, specular_color,
+                                    ambient=Vec4(0.4, 0.4, 0.5, 1),
+                                    diffuse=Vec4(1, 1, 1, 1))
     nodepath.setMaterial(material, 1)
\ No newline at end of file
@@ -2,6 +2,8 @@ import os
 from direct.actor.Actor import Actor
 from panda3d.core import BitMask32, NodePath
 
+_MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "models"))
+
 """
 Load a model or actor from `path`.
 Returns a tuple (model_node, anim_names).
@@ -11,26 +13,32 @@ Automatically reparents to `parent` (defaults to render).
 """
 def import_model(path: str, parent: NodePath = None, scale: float = 1.0, collide_mask=BitMask32(0)):
     if not os.path.isabs(path):
-        here = os.path.dirname(__file__)
-        path = os.path.abspath(os.path.join(here, "..", "models", path))
+        path = os.path.join(_MODELS_DIR, path)
 
     parent = parent or render
     anim_names = []
-    model_node = None
-
-    try:
-        actor = Actor(path)
-        names = actor.getAnimNames()
-        if names:
-            model_node = actor
-            anim_names = names
-        else:
-            actor.cleanup()
-    except Exception:
-        actor = None
 
-    if model_node is None:
-        model_node = loader.loadModel(path)
+    # Load once. Only a file with a skinned Character can carry animations, so
+    # static models skip the Actor round trip instead of being parsed twice.
+    model_node = loader.loadModel(path)
+    if model_node.find("**/+Character").isEmpty():
+        # Static models are never animated or addressed by part, so collapse the
+        # loaded hierarchy into as few Geoms (and draw calls) as possible.
+        model_node.clearModelNodes()
+        model_node.flattenStrong()
+    else:
+        try:
+            # Served from the loader's model cache populated above
+            actor = Actor(path)
+            names = actor.getAnimNames()
+            if names:
+                model_node.removeNode()
+                model_node = actor
+                anim_names = names
+            else:
+                actor.cleanup()
+        except Exception:
+            pass
 
     model_node.reparentTo(parent)
     model_node.setScale(scale)
@@ -1,7 +1,17 @@
 import json
+import logging
 import os
 from panda3d.core import WindowProperties, loadPrcFileData, Vec4, Vec3, BitMask32
 
+_log = logging.getLogger(__name__)
+
+# Default collision masks; game_constants['collision'] is built from the same bits
+DEFAULT_GROUND_MASK = BitMask32(1)
+DEFAULT_PLAYER_MASK = BitMask32(2)
+DEFAULT_TRIGGER_MASK = BitMask32(4)
+DEFAULT_CAMERA_MASK = BitMask32(8)
+ALL_OFF_MASK = BitMask32.allOff()
+
 class SettingsManager:
     def __init__(self, app):
         self.app = app
@@ -9,6 +19,7 @@ class SettingsManager:
         self._default_settings = self._get_default_settings()
         self.user_settings = self._default_settings['user_settings'].copy()
         self.constants = {}
+        self._change_listeners = []
         self.load_settings()
 
     def _get_default_settings(self):
@@ -38,7 +49,8 @@ class SettingsManager:
                     "FIRST_PERSON_MAX_PITCH": 85.0
                 },
                 "collision": {
-                    "MASK_GROUND": 1, "MASK_PLAYER": 2, "MASK_REACTIVE_TRIGGER": 4, "MASK_CAMERA": 8,
+                    "MASK_GROUND": DEFAULT_GROUND_MASK.getWord(), "MASK_PLAYER": DEFAULT_PLAYER_MASK.getWord(),
+                    "MASK_REACTIVE_TRIGGER": DEFAULT_TRIGGER_MASK.getWord(), "MASK_CAMERA": DEFAULT_CAMERA_MASK.getWord(),
                     "TAG_PLAYER": "Player", "TAG_REACTIVE": "ReactiveElement", "TAG_GEOMETRY": "Geometry",
                     "TAG_GEOMETRY_KEY": "Geometry"
                 },
@@ -491,6 +503,27 @@ class SettingsManager:
             val = self._default_settings['user_settings'].get(key, default)
         return val
 
+    def set_user_setting(self, key, value):
+        """Updates a user setting and notifies registered change listeners."""
+        self.user_settings[key] = value
+        self._notify_change(key)
+
+    def add_change_listener(self, callback):
+        """Registers callback(key) to be called whenever a user setting changes."""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _notify_change(self, key):
+        for callback in list(self._change_listeners):
+            try:
+                callback(key)
+            except Exception:
+                _log.exception("Error in settings change listener for '%s'", key)
+
     def get_effective_sensitivity(self):
         sens = self.user_settings.get('sensitivity')
         if sens is None: